@@ -2,7 +2,7 @@ import copy
 from itertools import combinations
 
 
-def solve_dpll(clauses, num_vars):
+def solve_dpll(clauses, num_vars, budget=None):
 
     def unit_propagate(formula, assignment):
         changed = True
@@ -64,6 +64,8 @@ def solve_dpll(clauses, num_vars):
     def dpll(formula, assignment):
         formula, assignment, conflict = unit_propagate(formula, assignment)
         if conflict:
+            if budget is not None:
+                budget.conflict()
             return None
         if not formula:
             return assignment  # SAT success!
@@ -71,6 +73,8 @@ def solve_dpll(clauses, num_vars):
         # Pick first literal in first remaining clause (naive)
         lit = formula[0][0]
         var = abs(lit)
+        if budget is not None:
+            budget.decision()
 
         # Try True
         res = dpll(formula + [[var]], copy.copy(assignment))
@@ -87,8 +91,8 @@ def solve_dpll(clauses, num_vars):
     return dpll(clauses, {})
 
 
-def solve_sat(clauses):
-    result = solve_dpll(clauses, 1000)
+def solve_sat(clauses, budget=None):
+    result = solve_dpll(clauses, 1000, budget)
     return result is not None
 
 
@@ -155,15 +159,16 @@ def encode_board(board):
     return clauses, var_map
 
 
-def infer_moves(board):
+def infer_moves(board, budget=None):
+    # One budget covers all the mine/safe checks of the board
     clauses, var_map = encode_board(board)
     results = {}
 
     for (r, c), v in var_map.items():
         # Assume mine
-        mine_sat = solve_sat(clauses + [[v]])
+        mine_sat = solve_sat(clauses + [[v]], budget)
         # Assume safe
-        safe_sat = solve_sat(clauses + [[-v]])
+        safe_sat = solve_sat(clauses + [[-v]], budget)
 
         if not mine_sat and safe_sat:
             results[(r, c)] = "SAFE"
@@ -285,9 +290,10 @@ unsolved_board = [
     [-1, -1,  0,  0,  0, -1]
 ]
 
-print("Solution Board (Ground Truth):")
-print_board(solution_board)
-print("\nStarting Board:")
-print_board(unsolved_board)
+if __name__ == "__main__":
+    print("Solution Board (Ground Truth):")
+    print_board(solution_board)
+    print("\nStarting Board:")
+    print_board(unsolved_board)
 
-auto_solve(unsolved_board, solution_board)
\ No newline at end of file
+    auto_solve(unsolved_board, solution_board)
\ No newline at end of file
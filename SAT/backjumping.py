@@ -1,36 +1,72 @@
+from codegen import compile_formula
+
 class CBJSolver:
-    def __init__(self, clauses, num_vars):
+    def __init__(self, clauses, num_vars, proof=None, budget=None):
         self.clauses = clauses
         self.num_vars = num_vars
+        self.proof = proof
+        self.budget = budget
         self.assignment = {}
         self.solution = None
         self.conflict_sets = {}
+        # Last nogood logged to the proof, None after an input clause conflict
+        self.lemma = None
+
+        # occ[v] lists (clause index, positive, negative occurrences of v) in
+        # clause order; true_cnt/free_cnt count true and unassigned literals
+        self.occ = [[] for _ in range(max([num_vars] + [abs(l) for c in clauses for l in c]) + 1)]
+        for i, clause in enumerate(clauses):
+            counts = {}
+            for lit in clause:
+                counts.setdefault(abs(lit), [0, 0])[lit < 0] += 1
+            for v, (p, n) in counts.items():
+                self.occ[v].append((i, p, n))
+        self.true_cnt = [0] * len(clauses)
+        self.free_cnt = [len(c) for c in clauses]
+        self.num_sat = 0
+        self.conflict = None
 
     def pick_unassigned(self):
         return next((v for v in range(1, self.num_vars + 1) if v not in self.assignment), None)
 
-    def clause_state(self, clause):
-        has_unassigned = False
-        for lit in clause:
-            val = self.assignment.get(abs(lit))
-            if val is None:
-                has_unassigned = True
-            elif (lit > 0 and val) or (lit < 0 and not val):
-                return "SAT"
-        return "UNRESOLVED" if has_unassigned else "CONFLICT"
+    def assign(self, v, val):
+        # The state before was conflict-free, so only v's clauses can be
+        # falsified now; the first of them in clause order is recorded
+        self.assignment[v] = val
+        self.conflict = None
+        for i, p, n in self.occ[v]:
+            self.free_cnt[i] -= p + n
+            t = p if val else n
+            if t:
+                if not self.true_cnt[i]:
+                    self.num_sat += 1
+                self.true_cnt[i] += t
+            elif not self.true_cnt[i] and not self.free_cnt[i] and self.conflict is None:
+                self.conflict = self.clauses[i]
+
+    def unassign(self, v):
+        val = self.assignment.pop(v)
+        self.conflict = None
+        for i, p, n in self.occ[v]:
+            self.free_cnt[i] += p + n
+            t = p if val else n
+            if t:
+                self.true_cnt[i] -= t
+                if not self.true_cnt[i]:
+                    self.num_sat -= 1
 
     def find_conflict(self):
-        for c in self.clauses:
-            if self.clause_state(c) == "CONFLICT":
-                return c
-        return None
+        return self.conflict
 
     def all_satisfied(self):
-        return all(self.clause_state(c) == "SAT" for c in self.clauses)
+        return self.num_sat == len(self.clauses)
 
     def search(self):
         c = self.find_conflict()
         if c:
+            if self.budget is not None:
+                self.budget.conflict()
+            self.lemma = None
             return False, {abs(l) for l in c}
 
         if self.all_satisfied():
@@ -38,27 +74,272 @@ class CBJSolver:
             return True, set()
 
         v = self.pick_unassigned()
+        if self.budget is not None:
+            self.budget.decision()
         self.conflict_sets[v] = set()
+        lemmas = []
         for val in (True, False):
-            self.assignment[v] = val
+            self.assign(v, val)
             sat, conf = self.search()
             if sat:
                 return True, set()
             conf = set(conf)
             if v not in conf:
-                del self.assignment[v]
+                self.unassign(v)
                 self.conflict_sets[v].update(conf)
+                if self.proof is not None:
+                    self.forget(lemmas)
                 return False, conf
+            if self.lemma is not None:
+                lemmas.append(self.lemma)
             conf.discard(v)
             self.conflict_sets[v].update(conf)
-            del self.assignment[v]
+            self.unassign(v)
 
         conf = set(self.conflict_sets[v])
+        if self.proof is not None:
+            self.log_nogood(conf)
+            self.forget(lemmas)
         conf.add(v)
         return False, conf
 
+    def log_nogood(self, conf):
+        # The current values of the assigned conflict variables cannot be
+        # extended; the clause forbidding them is RUP from the lemmas of
+        # both values of the exhausted variable.
+        self.lemma = [-u if self.assignment[u] else u for u in conf if u in self.assignment]
+        self.proof.add(self.lemma)
+
+    def forget(self, lemmas):
+        # Branch lemmas are only needed to derive their parent's nogood, and
+        # not at all when a backjump skips the parent
+        for lemma in lemmas:
+            self.proof.delete(lemma)
+
     def solve(self):
-        sat, _ = self.search()
+        # Empty clauses are false from the start; search() only detects
+        # conflicts in the clauses of the variable just assigned
+        sat = all(self.clauses) and self.search()[0]
+        if not sat and self.proof is not None:
+            self.proof.add([])
         return self.solution if sat else None
 
-def solve_backjumping(c, n): return CBJSolver(c, n).solve()
+class _MirroredAssignment(dict):
+    """Assignment dict that keeps the compiled kernels' false-literal array in step."""
+    def __init__(self, f):
+        super().__init__()
+        self.f = f
+
+    def __setitem__(self, v, val):
+        super().__setitem__(v, val)
+        self.f[2 * v + (not val)] = False
+        self.f[2 * v + bool(val)] = True
+
+    def __delitem__(self, v):
+        super().__delitem__(v)
+        self.f[2 * v] = self.f[2 * v + 1] = False
+
+class CompiledCBJSolver(CBJSolver):
+    """CBJSolver whose conflict and satisfaction checks use codegen kernels."""
+    def __init__(self, clauses, num_vars, proof=None, budget=None):
+        super().__init__(clauses, num_vars, proof, budget)
+        self.compiled = compile_formula(clauses, num_vars)
+        self.f = self.compiled.empty()
+        self.assignment = _MirroredAssignment(self.f)
+
+    # The kernels read the mirrored array, so the clause counters are not kept
+    def assign(self, v, val):
+        self.assignment[v] = val
+
+    def unassign(self, v):
+        del self.assignment[v]
+
+    def find_conflict(self):
+        return self.compiled.find_conflict(self.f)
+
+    def all_satisfied(self):
+        return self.compiled.all_satisfied(self.f)
+
+def solve_backjumping(c, n, proof=None, budget=None): return CBJSolver(c, n, proof, budget).solve()
+
+def solve_backjumping_compiled(c, n, proof=None, budget=None): return CompiledCBJSolver(c, n, proof, budget).solve()
+
+class CBJUPSolver:
+    """
+    CBJ with unit propagation. Propagation uses two watched literals and
+    records, for every assigned variable, a dependency mask over decision
+    levels: a decision sets its own level bit, a propagated literal takes
+    the OR of the masks of its reason clause's other literals. A conflict
+    set is the OR over the falsified clause, so it names only the decisions
+    that really caused the conflict; union is `|` and the deepest level is
+    `bit_length() - 1`.
+    """
+    def __init__(self, clauses, num_vars, proof=None, budget=None):
+        self.num_vars = n = max([num_vars] + [abs(l) for c in clauses for l in c])
+        self.proof = proof
+        self.budget = budget
+        self.clauses = []
+        self.units = []
+        self.empty = False
+        for c in clauses:
+            c = list(dict.fromkeys(c))
+            if any(-l in c for l in c):
+                continue
+            if not c:
+                self.empty = True
+            elif len(c) == 1:
+                self.units.append(c[0])
+            else:
+                self.clauses.append(c)
+
+        # val[l] is 1 / -1 / 0 for literal l true / false / unassigned;
+        # negative l wraps into the upper half of the list
+        self.val = [0] * (2 * n + 1)
+        self.dep = [0] * (n + 1)
+        self.watches = [[] for _ in range(2 * n + 1)]
+        for ci, c in enumerate(self.clauses):
+            self.watches[c[0]].append(ci)
+            self.watches[c[1]].append(ci)
+        self.trail = []
+        self.qhead = 0
+        self.decisions = [0]
+        self.lemma = None
+
+        # Static order: most frequent variables first
+        count = [0] * (n + 1)
+        for c in self.clauses:
+            for l in c:
+                count[abs(l)] += 1
+        self.order = sorted(range(1, n + 1), key=lambda v: -count[v])
+
+    def enqueue(self, lit, dep):
+        self.val[lit] = 1
+        self.val[-lit] = -1
+        self.dep[abs(lit)] = dep
+        self.trail.append(lit)
+
+    def undo(self, mark):
+        val, trail = self.val, self.trail
+        while len(trail) > mark:
+            lit = trail.pop()
+            val[lit] = val[-lit] = 0
+        self.qhead = mark
+
+    def propagate(self):
+        """Returns None, or the dependency mask of a falsified clause."""
+        val, dep, watches, clauses, trail = self.val, self.dep, self.watches, self.clauses, self.trail
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            ws = watches[false_lit]
+            keep = []
+            for k, ci in enumerate(ws):
+                c = clauses[ci]
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], c[0]
+                if val[c[0]] == 1:
+                    keep.append(ci)
+                    continue
+                for j in range(2, len(c)):
+                    if val[c[j]] != -1:
+                        c[1], c[j] = c[j], c[1]
+                        watches[c[1]].append(ci)
+                        break
+                else:
+                    keep.append(ci)
+                    mask = 0
+                    for l in c[1:]:
+                        mask |= dep[abs(l)]
+                    if val[c[0]] == -1:
+                        keep.extend(ws[k + 1:])
+                        watches[false_lit] = keep
+                        return mask | dep[abs(c[0])]
+                    self.enqueue(c[0], mask)
+            watches[false_lit] = keep
+        return None
+
+    def log_nogood(self, mask):
+        # Negation of the decisions in `mask`: RUP, because propagation from
+        # them reaches the conflict, or because the nogoods logged for both
+        # values of the deepest decision in it are present
+        level = 1
+        clause = []
+        while mask >> level:
+            if mask >> level & 1:
+                clause.append(-self.decisions[level])
+            level += 1
+        self.proof.add(clause)
+        self.lemma = clause
+
+    def forget(self, lemmas):
+        # Deletes the branch lemmas once the parent's nogood is logged or a
+        # backjump has passed over the parent
+        for lemma in lemmas:
+            self.proof.delete(lemma)
+
+    def nogood(self, mask):
+        # Called for every conflict set, at leaves and on backtracking
+        if self.proof is not None:
+            self.log_nogood(mask)
+
+    def branches(self, v):
+        return v, -v
+
+    def search(self):
+        """Returns True, or the conflict set of this subtree as a level mask."""
+        conflict = self.propagate()
+        if conflict is not None:
+            if self.budget is not None:
+                self.budget.conflict()
+            self.nogood(conflict)
+            return conflict
+
+        v = next((v for v in self.order if not self.val[v]), None)
+        if v is None:
+            return True
+        if self.budget is not None:
+            self.budget.decision()
+
+        level = len(self.decisions)
+        bit = 1 << level
+        mark = len(self.trail)
+        conf = 0
+        lemmas = []
+        for lit in self.branches(v):
+            self.decisions.append(lit)
+            self.enqueue(lit, bit)
+            res = self.search()
+            if res is True:
+                return True
+            self.decisions.pop()
+            self.undo(mark)
+            if not res & bit:
+                if self.proof is not None:
+                    self.forget(lemmas)
+                return res
+            conf |= res & ~bit
+            if self.proof is not None:
+                lemmas.append(self.lemma)
+
+        self.nogood(conf)
+        if self.proof is not None:
+            self.forget(lemmas)
+        return conf
+
+    def solve(self):
+        sat = False
+        if not self.empty:
+            for lit in self.units:
+                if self.val[lit] == -1:
+                    break
+                if not self.val[lit]:
+                    self.enqueue(lit, 0)
+            else:
+                sat = self.search() is True
+        if not sat:
+            if self.proof is not None:
+                self.proof.add([])
+            return None
+        return {v: self.val[v] == 1 for v in range(1, self.num_vars + 1)}
+
+def solve_backjumping_up(c, n, proof=None, budget=None): return CBJUPSolver(c, n, proof, budget).solve()
@@ -0,0 +1,132 @@
+from collections import defaultdict
+
+def implication_graph(clauses):
+    """Maps each literal to the literals its binary clauses imply: [a, b] gives -a -> b and -b -> a."""
+    imp = defaultdict(list)
+    for c in clauses:
+        if len(c) == 2:
+            a, b = c
+            imp[-a].append(b)
+            imp[-b].append(a)
+    return imp
+
+def add_binary(imp, clause):
+    """Adds the two implications of a binary clause to `imp`."""
+    a, b = clause
+    imp[-a].append(b)
+    imp[-b].append(a)
+
+def remove_binaries(imp, clauses):
+    """Undoes add_binary for `clauses`, which must be the latest ones added."""
+    for a, b in reversed(clauses):
+        imp[-b].pop()
+        imp[-a].pop()
+
+def propagate_binary(imp, queue, a):
+    """
+    Assigns every literal in `queue` and everything it implies through
+    `imp`, breadth first. Returns the literals newly assigned, or None on
+    conflict. `a` is updated in place.
+    """
+    trail = []
+    i = 0
+    while i < len(queue):
+        lit = queue[i]
+        i += 1
+        v = abs(lit)
+        if v in a:
+            if a[v] != (lit > 0):
+                return None
+            continue
+        a[v] = lit > 0
+        trail.append(lit)
+        for q in imp.get(lit, ()):
+            if abs(q) in a:
+                if a[abs(q)] != (q > 0):
+                    return None
+            else:
+                queue.append(q)
+    return trail
+
+def equivalent_literals(clauses, num_vars):
+    """
+    Finds strongly connected components of the binary implication graph.
+    Literals in one component are equivalent. Returns {var: literal} mapping
+    each substituted variable to its representative (the component
+    literal with the smallest variable), or None when some x and -x
+    share a component, which makes the formula UNSAT.
+    """
+    imp = implication_graph(clauses)
+    index, low, on_stack = {}, {}, set()
+    stack, comps = [], []
+    counter = 0
+    for root in [l for v in range(1, num_vars + 1) for l in (v, -v)]:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(imp.get(root, ())))]
+        while work:
+            node, it = work[-1]
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(imp.get(nxt, ()))))
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    comp = []
+                    while True:
+                        l = stack.pop()
+                        on_stack.discard(l)
+                        comp.append(l)
+                        if l == node:
+                            break
+                    if len(comp) > 1:
+                        comps.append(comp)
+
+    rep = {}
+    for comp in comps:
+        members = set(comp)
+        if any(-l in members for l in comp):
+            return None
+        r = min(comp, key=abs)
+        for l in comp:
+            if l != r:
+                rep[abs(l)] = r if l > 0 else -r
+    return rep
+
+def substitute(clauses, rep):
+    """
+    Rewrites clauses over representatives, merging repeated literals.
+    Tautologies are kept so their variables still get a value.
+    """
+    out = []
+    for c in clauses:
+        new = []
+        for l in c:
+            r = rep.get(abs(l))
+            if r is not None:
+                l = r if l > 0 else -r
+            if l not in new:
+                new.append(l)
+        out.append(new)
+    return out
+
+def extend_model(model, rep):
+    """Assigns substituted variables from their representatives; unset representatives default to True."""
+    for v, r in rep.items():
+        val = model.setdefault(abs(r), True)
+        model[v] = val if r > 0 else not val
+    return model
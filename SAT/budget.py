@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows; memory limits are then ignored
+    resource = None
+
+SAT, UNSAT, UNKNOWN = "SAT", "UNSAT", "UNKNOWN"
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def rss_mb():
+    """
+    Current resident set size in MiB, from /proc/self/statm. Without
+    /proc, peak RSS from getrusage is used instead, which never goes down.
+    None when neither is available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2**20
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB, except on macOS, where it is in bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+class BudgetExceeded(Exception):
+    def __init__(self, reason):
+        super().__init__(f"{reason} budget exceeded")
+        self.reason = reason
+
+class Budget:
+    """
+    Cooperative limits for one solver run. Solvers call decision() for
+    every branch and conflict() for every dead end, and tick() inside
+    other long loops. The counters and the clock are checked on every
+    call; memory (a file read or system call) only every `poll_every`
+    calls. When a limit is hit, BudgetExceeded is raised and the
+    counters stay readable.
+    """
+    def __init__(self, time_limit=None, max_decisions=None, max_conflicts=None,
+                 max_memory_mb=None, poll_every=256):
+        self.start = time.monotonic()
+        self.deadline = self.start + time_limit if time_limit is not None else float("inf")
+        self.max_decisions = max_decisions if max_decisions is not None else float("inf")
+        self.max_conflicts = max_conflicts if max_conflicts is not None else float("inf")
+        self.max_memory_mb = max_memory_mb
+        self.poll_every = poll_every
+        self.decisions = self.conflicts = 0
+        self.reason = None
+        self._ticks = poll_every
+
+    def _exceeded(self, reason):
+        self.reason = reason
+        raise BudgetExceeded(reason)
+
+    def decision(self):
+        self.decisions += 1
+        if self.decisions > self.max_decisions:
+            self._exceeded("decision")
+        self.tick()
+
+    def conflict(self):
+        self.conflicts += 1
+        if self.conflicts > self.max_conflicts:
+            self._exceeded("conflict")
+        self.tick()
+
+    def tick(self):
+        """Checks the clock, and polls every `poll_every` calls, without counting anything."""
+        if time.monotonic() > self.deadline:
+            self._exceeded("time")
+        self._ticks -= 1
+        if self._ticks <= 0:
+            self.poll()
+
+    def poll(self):
+        self._ticks = self.poll_every
+        if self.max_memory_mb is not None:
+            rss = rss_mb()
+            if rss is not None and rss > self.max_memory_mb:
+                self._exceeded("memory")
+
+    def stats(self):
+        return {"decisions": self.decisions, "conflicts": self.conflicts,
+                "time": time.monotonic() - self.start, "exceeded": self.reason}
+
+def solve_with_budget(solver, clauses, num_vars, budget=None, complete=True, **kw):
+    """
+    Runs solver(clauses, num_vars, budget=budget) in-process and returns
+    (status, model). status is UNKNOWN when the budget runs out, or when
+    an incomplete solver (complete=False) finds no model.
+    """
+    try:
+        model = solver(clauses, num_vars, budget=budget, **kw)
+    except BudgetExceeded:
+        return UNKNOWN, None
+    if model is not None:
+        return SAT, model
+    return (UNSAT if complete else UNKNOWN), None
@@ -0,0 +1,87 @@
+import json
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+_MISSING = object()
+
+def canonical_clauses(clauses: List[List[int]]) -> List[Tuple[int, ...]]:
+    """Sorted, duplicate-free clauses of sorted, duplicate-free literals."""
+    return sorted({tuple(sorted(set(c))) for c in clauses})
+
+def formula_key(clauses: List[List[int]], num_vars: int, namespace: str = "") -> str:
+    """
+    Content hash of a CNF that ignores clause order, literal order and
+    duplicate literals or clauses, so equivalent encodings share a key.
+    """
+    h = hashlib.sha256(f"{namespace}\np {num_vars}\n".encode())
+    for c in canonical_clauses(clauses):
+        h.update(" ".join(map(str, c)).encode())
+        h.update(b" 0\n")
+    return h.hexdigest()
+
+class ResultCache:
+    """
+    Cache of solver results by formula_key. A result is a model dict
+    for SAT or None for UNSAT. Recent entries stay in an in-memory LRU;
+    with `path`, every entry is also written to a SQLite file, which is
+    checked on memory misses.
+    Only cache complete solvers: an incomplete solver's None is not UNSAT.
+    """
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.hits = self.disk_hits = self.misses = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, model TEXT)")
+
+    def _remember(self, key, model):
+        self.memory[key] = model
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str, default=_MISSING):
+        if key in self.memory:
+            self.hits += 1
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        if self.db is not None:
+            row = self.db.execute("SELECT model FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                lits = json.loads(row[0])
+                model = None if lits is None else {abs(l): l > 0 for l in lits}
+                self._remember(key, model)
+                return model
+        self.misses += 1
+        return default
+
+    def put(self, key: str, model: Optional[Dict[int, bool]]):
+        model = None if model is None else dict(model)
+        self._remember(key, model)
+        if self.db is not None:
+            lits = None if model is None else [v if val else -v for v, val in model.items()]
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (key, json.dumps(lits)))
+            self.db.commit()
+
+    def solve(self, solver, clauses, num_vars, namespace: str = ""):
+        """Returns solver(clauses, num_vars), reusing a cached result when there is one."""
+        key = formula_key(clauses, num_vars, namespace)
+        model = self.get(key)
+        if model is _MISSING:
+            model = solver(clauses, num_vars)
+            self.put(key, model)
+        return None if model is None else dict(model)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "size": len(self.memory)}
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,68 @@
+from multiprocessing import shared_memory
+
+HEADER = 3  # head, slots, max_len
+
+class ClauseRing:
+    """
+    Single-writer, many-reader ring of short clauses in shared memory,
+    without locks. The buffer is an array of int64 words:
+    [head, slots, max_len, slot 0, slot 1, ...], where a slot is
+    [stamp, length, lit 1 .. lit max_len].
+
+    The writer clears a slot's stamp, fills it, stamps it with the clause's
+    sequence number + 1 and then advances head. A reader accepts a slot only
+    if the stamp is the expected one both before and after copying it, so a
+    slot overwritten mid-read is skipped, as are clauses a slow reader has
+    fallen more than `slots` behind on. Aligned 8-byte stores are atomic on
+    the platforms multiprocessing.shared_memory supports.
+    """
+    def __init__(self, name=None, slots=4096, max_len=8):
+        if name is None:
+            size = 8 * (HEADER + slots * (max_len + 2))
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.words = self.shm.buf.cast("q")
+            self.words[0], self.words[1], self.words[2] = 0, slots, max_len
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.words = self.shm.buf.cast("q")
+        self.name = self.shm.name
+        self.slots = self.words[1]
+        self.max_len = self.words[2]
+        self.width = self.max_len + 2
+
+    def push(self, clause):
+        """Appends a clause; returns False if it is longer than max_len."""
+        if len(clause) > self.max_len:
+            return False
+        words = self.words
+        seq = words[0]
+        off = HEADER + seq % self.slots * self.width
+        words[off] = 0
+        words[off + 1] = len(clause)
+        for i, lit in enumerate(clause, off + 2):
+            words[i] = lit
+        words[off] = seq + 1
+        words[0] = seq + 1
+        return True
+
+    def read(self, cursor=0):
+        """Returns (clauses pushed since `cursor`, new cursor)."""
+        words = self.words
+        head = words[0]
+        out = []
+        for seq in range(max(cursor, head - self.slots), head):
+            off = HEADER + seq % self.slots * self.width
+            if words[off] != seq + 1:
+                continue
+            k = words[off + 1]
+            clause = words[off + 2:off + 2 + k].tolist() if 0 < k <= self.max_len else None
+            if clause is not None and words[off] == seq + 1:
+                out.append(clause)
+        return out, head
+
+    def close(self):
+        self.words.release()
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
@@ -0,0 +1,158 @@
+from collections import OrderedDict
+from cache import canonical_clauses, formula_key
+
+# Literals are indices into a flat list `f`: 2*v for v and 2*v + 1 for -v.
+# f[i] is True when literal i is false, so a literal is true exactly when
+# its complement is false, and an unassigned variable has both slots False.
+# The generated kernels then need no abs(), dict lookups or sign checks.
+# Kernels are built over canonical_clauses, so one compilation serves every
+# formula with the same formula_key.
+
+_COMPILED = OrderedDict()
+MAX_COMPILED = 32
+
+def lit_index(lit):
+    return 2 * lit if lit > 0 else -2 * lit + 1
+
+def _groups(clauses):
+    """Clauses grouped by length as flat tuples: the clause, literal indices, complement indices."""
+    groups = {}
+    for c in clauses:
+        idx = [lit_index(l) for l in c]
+        groups.setdefault(len(idx), []).append((c,) + tuple(idx) + tuple(i ^ 1 for i in idx))
+    return {k: tuple(v) for k, v in groups.items()}
+
+def _source(lengths):
+    lines = []
+    emit = lines.append
+
+    # First falsified clause (shortest first), or None
+    emit("def find_conflict(f):")
+    for k in lengths:
+        if k == 0:
+            emit("    for c, in C0: return c")
+            continue
+        a = ", ".join(f"a{i}" for i in range(k))
+        n = ", ".join(f"n{i}" for i in range(k))
+        emit(f"    for c, {a}, {n} in C{k}:")
+        emit(f"        if {' and '.join(f'f[a{i}]' for i in range(k))}: return c")
+    emit("    return None")
+    emit("")
+
+    emit("def all_satisfied(f):")
+    for k in lengths:
+        if k == 0:
+            emit("    if C0: return False")
+            continue
+        a = ", ".join(f"a{i}" for i in range(k))
+        n = ", ".join(f"n{i}" for i in range(k))
+        emit(f"    for c, {a}, {n} in C{k}:")
+        emit(f"        if not ({' or '.join(f'f[n{i}]' for i in range(k))}): return False")
+    emit("    return True")
+    emit("")
+
+    # Assigns every unit literal until a fixpoint; newly true literals are
+    # pushed on `trail`. Returns False on conflict.
+    emit("def propagate(f, trail):")
+    emit("    push = trail.append")
+    emit("    changed = True")
+    emit("    while changed:")
+    emit("        changed = False")
+    for k in lengths:
+        if k == 0:
+            emit("        if C0: return False")
+            continue
+        a = ", ".join(f"a{i}" for i in range(k))
+        n = ", ".join(f"n{i}" for i in range(k))
+        emit(f"        for c, {a}, {n} in C{k}:")
+        emit(f"            if {' or '.join(f'f[n{i}]' for i in range(k))}: continue")
+        for i in range(k):
+            others = [f"f[a{j}]" for j in range(k) if j != i]
+            cond = " and ".join(others) if others else "True"
+            kw = "if" if i == 0 else "elif"
+            emit(f"            {kw} {cond}:")
+            emit(f"                if f[a{i}]: return False")
+            emit(f"                f[n{i}] = True; push(a{i}); changed = True")
+    emit("    return True")
+    emit("")
+
+    # First literal (in clause order) of the first clause not yet satisfied
+    emit("def first_open(f):")
+    emit("    for c in ORDER:")
+    emit("        for i in c:")
+    emit("            if f[i ^ 1]: break")
+    emit("        else:")
+    emit("            for i in c:")
+    emit("                if not f[i]: return i")
+    emit("    return -1")
+    return "\n".join(lines)
+
+class CompiledFormula:
+    """Propagation and conflict-check kernels specialised to one formula."""
+    def __init__(self, clauses, num_vars):
+        self.num_vars = num_vars
+        clauses = canonical_clauses(clauses)
+        groups = _groups(clauses)
+        namespace = {f"C{k}": v for k, v in groups.items()}
+        namespace["ORDER"] = tuple(tuple(lit_index(l) for l in c) for c in clauses)
+        self.source = _source(sorted(groups))
+        exec(compile(self.source, "<cnf kernels>", "exec"), namespace)
+        self.find_conflict = namespace["find_conflict"]
+        self.all_satisfied = namespace["all_satisfied"]
+        self.propagate = namespace["propagate"]
+        self.first_open = namespace["first_open"]
+
+    def empty(self):
+        return [False] * (2 * self.num_vars + 2)
+
+def compile_formula(clauses, num_vars):
+    """Returns the CompiledFormula for clauses, reusing it when an equal formula was compiled before."""
+    key = formula_key(clauses, num_vars)
+    cf = _COMPILED.get(key)
+    if cf is None:
+        cf = _COMPILED[key] = CompiledFormula(clauses, num_vars)
+        if len(_COMPILED) > MAX_COMPILED:
+            _COMPILED.popitem(last=False)
+    else:
+        _COMPILED.move_to_end(key)
+    return cf
+
+def solve_dpll_compiled(clauses, num_vars, budget=None):
+    """
+    DPLL over the compiled kernels with an undo trail instead of formula
+    copies. Branches like solve_dpll, on the first unassigned literal of
+    the first open clause (in canonical order), true first.
+    """
+    cf = compile_formula(clauses, num_vars)
+    f = cf.empty()
+    trail = []
+    propagate, first_open = cf.propagate, cf.first_open
+
+    def undo(mark):
+        while len(trail) > mark:
+            f[trail.pop() ^ 1] = False
+
+    def search():
+        mark = len(trail)
+        if not propagate(f, trail):
+            undo(mark)
+            if budget is not None:
+                budget.conflict()
+            return False
+        i = first_open(f)
+        if i < 0:
+            return True
+        if budget is not None:
+            budget.decision()
+        for d in (i & ~1, i | 1):
+            f[d ^ 1] = True
+            trail.append(d)
+            if search():
+                return True
+            undo(len(trail) - 1)
+        undo(mark)
+        return False
+
+    if not search():
+        return None
+    return {i >> 1: not i & 1 for i in trail}
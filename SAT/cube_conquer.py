@@ -0,0 +1,179 @@
+import os
+import math
+import time
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from parsing import parse_dimacs_cnf
+from budget import Budget, BudgetExceeded, SAT, UNSAT, UNKNOWN
+from lookahead import LookaheadSolver
+from backjumping import solve_backjumping_up
+
+SPLIT = "SPLIT"
+
+# Per-worker state, set once by _init_worker so cubes travel without the formula
+_formula = None
+_steal = None
+_stop = None
+
+def _init_worker(clauses, num_vars, solver, steal, stop):
+    global _formula, _steal, _stop
+    _formula = (clauses, num_vars, solver)
+    _steal, _stop = steal, stop
+
+class SliceBudget(Budget):
+    """
+    Worker budget that also gives up when the driver stops, or when idle
+    workers are waiting (steal > 0) and this cube has run for `min_slice`
+    seconds. Both are checked on the budget's periodic poll.
+    """
+    def __init__(self, min_slice, **kw):
+        super().__init__(**kw)
+        self.min_slice = min_slice
+
+    def poll(self):
+        super().poll()
+        if _stop.is_set():
+            self._exceeded("stop")
+        if _steal.value > 0 and time.monotonic() - self.start >= self.min_slice:
+            with _steal.get_lock():
+                if _steal.value > 0:
+                    _steal.value -= 1
+                    self._exceeded("split")
+
+def split(clauses, num_vars, cube, depth, budget=None):
+    """Splits a cube `depth` more levels with the lookahead heuristic."""
+    units = [[l] for l in cube]
+    subs = LookaheadSolver(clauses + units, num_vars, budget=budget).emit_cubes(depth)
+    if not subs:
+        return UNSAT, None
+    if [] in subs:
+        # Propagating the cube already satisfies every clause
+        return SAT, LookaheadSolver(clauses + units, num_vars, budget=budget).solve()
+    return SPLIT, [cube + s for s in subs]
+
+def conquer(cube, time_limit, min_slice, split_depth):
+    """
+    Solves the formula under the unit clauses of `cube` in a worker.
+    Returns (SAT, model), (UNSAT, None), (SPLIT, sub-cubes) when asked to
+    give its work up, or (UNKNOWN, None) when stopped or out of time.
+    """
+    clauses, num_vars, solver = _formula
+    if _stop.is_set():
+        return UNKNOWN, None
+    budget = SliceBudget(min_slice, time_limit=time_limit)
+    try:
+        model = solver(clauses + [[l] for l in cube], num_vars, budget=budget)
+        return (SAT, model) if model else (UNSAT, None)
+    except BudgetExceeded as e:
+        if e.reason != "split":
+            return UNKNOWN, None
+    # Split under the same clock and stop flag, without yielding again
+    budget.min_slice = float("inf")
+    try:
+        return split(clauses, num_vars, cube, split_depth, budget)
+    except BudgetExceeded:
+        return UNKNOWN, None
+
+def _remaining(budget):
+    # Seconds left on the budget's clock, None when there is no time limit
+    if budget is None or budget.deadline == float("inf"):
+        return None
+    return max(0.0, budget.deadline - time.monotonic())
+
+def default_depth(workers):
+    """Initial split depth giving about 8 cubes per worker."""
+    return math.ceil(math.log2(8 * workers))
+
+def _timeout(budget):
+    if budget is not None:
+        budget.reason = "time"
+    raise BudgetExceeded("time")
+
+def solve_cube_and_conquer(clauses, num_vars, budget=None, workers=None, depth=None,
+                           solver=solve_backjumping_up, min_slice=0.5, split_depth=2):
+    """
+    Cube-and-conquer: the lookahead solver splits the formula into cubes
+    (about 8 per worker unless `depth` is given), which a process pool
+    solves with `solver` under each cube's unit clauses. When the queue is
+    empty and workers sit idle, running cubes older than `min_slice`
+    seconds are split `split_depth` levels further and re-queued. The
+    first SAT cube stops everything; UNSAT needs every cube refuted.
+
+    The driver's budget counts a decision per lookahead node of the
+    initial split and per dispatched cube, and a conflict per refuted
+    cube; its time limit bounds the whole run.
+    """
+    if any(not c for c in clauses):
+        return None
+    workers = workers or os.cpu_count() or 1
+    if depth is None:
+        depth = default_depth(workers)
+    cubes = LookaheadSolver(clauses, num_vars, budget=budget).emit_cubes(depth)
+    if not cubes:
+        return None
+
+    ctx = multiprocessing.get_context("spawn")
+    steal = ctx.Value("i", 0)
+    stop = ctx.Event()
+    pool = ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                               initargs=(clauses, num_vars, solver, steal, stop))
+    pending = deque(cubes)
+    running = set()
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                if budget is not None:
+                    budget.decision()
+                running.add(pool.submit(conquer, pending.popleft(), _remaining(budget),
+                                        min_slice, split_depth))
+            # Idle workers and nothing queued: ask that many running cubes to split
+            with steal.get_lock():
+                steal.value = 0 if pending else workers - len(running)
+            done, _ = wait(running, timeout=_remaining(budget), return_when=FIRST_COMPLETED)
+            if not done:
+                _timeout(budget)
+            for fut in done:
+                running.discard(fut)
+                status, result = fut.result()
+                if status == SAT:
+                    return result
+                if status == SPLIT:
+                    pending.extend(result)
+                elif status == UNKNOWN:
+                    _timeout(budget)
+                elif budget is not None:
+                    budget.conflict()
+        return None
+    finally:
+        stop.set()
+        pool.shutdown(cancel_futures=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Cube-and-conquer SAT solving on a process pool.")
+    ap.add_argument("file", help="DIMACS CNF file")
+    ap.add_argument("--workers", type=int, help="conquer processes (default: CPU count)")
+    ap.add_argument("--depth", type=int, help="initial split depth (default: about 8 cubes per worker)")
+    ap.add_argument("--time-limit", type=float)
+    ap.add_argument("--emit", metavar="PATH", help="only write the cubes to PATH as 'a <lits> 0' lines")
+    args = ap.parse_args(argv)
+
+    clauses, num_vars = parse_dimacs_cnf(args.file)
+    if args.emit:
+        depth = args.depth if args.depth is not None else default_depth(args.workers or os.cpu_count() or 1)
+        cubes = LookaheadSolver(clauses, num_vars).emit_cubes(depth, args.emit)
+        print(f"{len(cubes)} cubes written to {args.emit}")
+        return
+    budget = Budget(time_limit=args.time_limit)
+    start = time.time()
+    try:
+        model = solve_cube_and_conquer(clauses, num_vars, budget, args.workers, args.depth)
+        status = SAT if model else UNSAT
+    except BudgetExceeded:
+        status = UNKNOWN
+    print(f"{status} in {time.time() - start:.4f}s "
+          f"({budget.decisions} cubes, {budget.conflicts} refuted)")
+
+if __name__ == "__main__":
+    main()
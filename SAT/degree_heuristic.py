@@ -1,49 +1,74 @@
-def solve_degree_heuristic(clauses, num_vars):
+def solve_degree_heuristic(clauses, num_vars, budget=None):
+    if any(not c for c in clauses):
+        return None
+    top = max([num_vars] + [abs(l) for c in clauses for l in c])
+
+    # occ[v] lists (clause, positive occurrences, negative occurrences);
+    # true_cnt/free_cnt count true and unassigned literals per clause, and
+    # score[v] is the number of unsatisfied clauses containing v
+    occ = [[] for _ in range(top + 1)]
+    cvars = []
+    for i, clause in enumerate(clauses):
+        counts = {}
+        for lit in clause:
+            counts.setdefault(abs(lit), [0, 0])[lit < 0] += 1
+        for v, (p, n) in counts.items():
+            occ[v].append((i, p, n))
+        cvars.append(list(counts))
+    true_cnt = [0] * len(clauses)
+    free_cnt = [len(c) for c in clauses]
+    score = [len(o) for o in occ]
+
+    def assign(var, val):
+        # Only clauses containing var can become falsified
+        ok = True
+        for i, p, n in occ[var]:
+            free_cnt[i] -= p + n
+            t = p if val else n
+            if t:
+                if not true_cnt[i]:
+                    for u in cvars[i]:
+                        score[u] -= 1
+                true_cnt[i] += t
+            elif not true_cnt[i] and not free_cnt[i]:
+                ok = False
+        return ok
 
-    def consistent(a):
-        for clause in clauses:
-            clause_val = False
-            all_assigned = True
-            for lit in clause:
-                if abs(lit) not in a:
-                    all_assigned = False
-                else:
-                    v = a[abs(lit)]
-                    if (lit > 0 and v) or (lit < 0 and not v):
-                        clause_val = True
-                        break
-            if all_assigned and not clause_val:
-                return False
-        return True
+    def unassign(var, val):
+        for i, p, n in occ[var]:
+            free_cnt[i] += p + n
+            t = p if val else n
+            if t:
+                true_cnt[i] -= t
+                if not true_cnt[i]:
+                    for u in cvars[i]:
+                        score[u] += 1
 
-    def choose_var(vars, a):
+    def choose_var(a):
         best = None
         best_score = -1
-        for v in vars:
-            score = sum(
-                not any(
-                    abs(l) in a and 
-                    ((l > 0 and a[abs(l)]) or (l < 0 and not a[abs(l)]))
-                    for l in c
-                )
-                for c in clauses if v in [abs(l) for l in c]
-            )
-            if score > best_score:
+        for v in range(1, num_vars + 1):
+            if v not in a and score[v] > best_score:
                 best = v
-                best_score = score
+                best_score = score[v]
         return best
 
-    def backtrack(a, vars):
-        if not vars:
-            return a if consistent(a) else None
-        var = choose_var(vars, a)
+    def backtrack(a):
+        if len(a) == num_vars:
+            return a
+        var = choose_var(a)
+        if budget is not None:
+            budget.decision()
         for val in (True, False):
             a[var] = val
-            if consistent(a):
-                result = backtrack(a, vars - {var})
+            if assign(var, val):
+                result = backtrack(a)
                 if result:
                     return result
+            elif budget is not None:
+                budget.conflict()
+            unassign(var, val)
             del a[var]
         return None
 
-    return backtrack({}, set(range(1, num_vars + 1)))
+    return backtrack({})
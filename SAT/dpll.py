@@ -1,58 +1,141 @@
 import copy
+from itertools import islice, product
+from binary import (implication_graph, add_binary, remove_binaries, propagate_binary,
+                    equivalent_literals, substitute, extend_model)
 
-def solve_dpll(clauses, num_vars):
-
-    def unit_propagate(formula, a):
-        changed = True
-        while changed:
-            changed = False
-            units = []
-            for clause in formula:
-                unassigned = []
-                satisfied = False
-                for lit in clause:
-                    if abs(lit) in a:
-                        v = a[abs(lit)]
-                        if (lit > 0 and v) or (lit < 0 and not v):
-                            satisfied = True
-                            break
-                    else:
-                        unassigned.append(lit)
-                if satisfied:
-                    continue
-                if not unassigned:
-                    return None, None, True
-                if len(unassigned) == 1:
-                    units.append(unassigned[0])
-            for lit in set(units):
-                v = abs(lit)
-                val = lit > 0
-                if v in a and a[v] != val:
-                    return None, None, True
-                if v not in a:
-                    a[v] = val
-                    changed = True
-
-        new_f = []
-        for clause in formula:
-            if any(abs(l) in a and ((l > 0 and a[abs(l)]) or (l < 0 and not a[abs(l)])) for l in clause):
+def unit_propagate(formula, a, imp=None, added=None):
+    # Binary clauses are propagated through implication lists; only the
+    # longer clauses are rescanned after each round. The first scan
+    # covers every clause so units already present at entry are found.
+    # `imp` must hold every binary clause of the formula. A search builds
+    # it once and passes it down: clauses this call shortens to two
+    # literals are added to it and appended to `added`, for the caller
+    # to remove with remove_binaries when it backtracks.
+    if imp is None:
+        imp = implication_graph(formula)
+    longer = formula
+    while True:
+        units = []
+        for clause in longer:
+            unassigned = []
+            satisfied = False
+            for lit in clause:
+                if abs(lit) in a:
+                    v = a[abs(lit)]
+                    if (lit > 0 and v) or (lit < 0 and not v):
+                        satisfied = True
+                        break
+                else:
+                    unassigned.append(lit)
+            if satisfied:
                 continue
-            new_clause = [l for l in clause if abs(l) not in a]
-            new_f.append(new_clause)
-        return new_f, a, False
+            if not unassigned:
+                return None, None, True
+            if len(unassigned) == 1:
+                units.append(unassigned[0])
+        if longer is formula:
+            longer = [c for c in formula if len(c) != 2]
+        if not units:
+            break
+        if propagate_binary(imp, units, a) is None:
+            return None, None, True
 
-    def backtrack(formula, a):
-        formula, a, conflict = unit_propagate(formula, a)
+    new_f = []
+    for clause in formula:
+        if any(abs(l) in a and ((l > 0 and a[abs(l)]) or (l < 0 and not a[abs(l)])) for l in clause):
+            continue
+        new_clause = [l for l in clause if abs(l) not in a]
+        if added is not None and len(new_clause) == 2 and len(clause) > 2:
+            add_binary(imp, new_clause)
+            added.append(new_clause)
+        new_f.append(new_clause)
+    return new_f, a, False
+
+def solve_dpll(clauses, num_vars, proof=None, budget=None):
+    # Equivalent literals (cycles in the binary implication graph) are
+    # merged before the search. The substitution is not a DRAT step, so
+    # it is skipped when a proof is requested.
+    rep = {}
+    if proof is None:
+        rep = equivalent_literals(clauses, num_vars)
+        if rep is None:
+            return None
+        if rep:
+            clauses = substitute(clauses, rep)
+    imp = implication_graph(clauses)
+
+    # With a proof writer, every refuted node logs the negation of its
+    # decision path (RUP from its two children), then the children's
+    # lemmas are deleted. The root logs the empty clause.
+    def backtrack(formula, a, path):
+        added = []
+        formula, a, conflict = unit_propagate(formula, a, imp, added)
         if conflict:
+            if budget is not None:
+                budget.conflict()
+            if proof is not None:
+                proof.add([-d for d in path])
             return None
         if not formula:
             return a
         lit = formula[0][0]
         var = abs(lit)
+        if budget is not None:
+            budget.decision()
         for val in (True, False):
-            r = backtrack(formula + [[var if val else -var]], copy.copy(a))
+            d = var if val else -var
+            r = backtrack(formula + [[d]], copy.copy(a), path + [d])
             if r:
                 return r
+        if proof is not None:
+            refuted = [-d for d in path]
+            proof.add(refuted)
+            proof.delete(refuted + [-var])
+            proof.delete(refuted + [var])
+        remove_binaries(imp, added)
         return None
 
-    return backtrack(clauses, {})
+    model = backtrack(clauses, {}, [])
+    return extend_model(model, rep) if model else model
+
+def enumerate_models(clauses, num_vars, project=None, limit=None):
+    """
+    Lazily yields models as {var: bool} over the `project` variables
+    (all variables by default), each projection exactly once, up to
+    `limit`. Enumeration is decision-based: only projected variables are
+    branched on, the two branches cover disjoint model sets, and no
+    blocking clauses are added, so the search never restarts. Once no
+    projected variable is left in the formula, one DPLL call decides
+    whether a completion exists. The projected variables that are still
+    free are then expanded.
+    """
+    project = sorted(set(project)) if project is not None else list(range(1, num_vars + 1))
+    wanted = set(project)
+    imp = implication_graph(clauses)
+
+    def models(formula, a):
+        added = []
+        formula, a, conflict = unit_propagate(formula, a, imp, added)
+        if conflict:
+            return
+        try:
+            yield from expand(formula, a)
+        finally:
+            remove_binaries(imp, added)
+
+    def expand(formula, a):
+        var = next((abs(l) for c in formula for l in c if abs(l) in wanted), None)
+        if var is None:
+            if formula and solve_dpll(formula, num_vars) is None:
+                return
+            fixed = {v: a[v] for v in project if v in a}
+            free = [v for v in project if v not in a]
+            for vals in product((True, False), repeat=len(free)):
+                m = dict(fixed)
+                m.update(zip(free, vals))
+                yield m
+            return
+        for val in (True, False):
+            yield from models(formula + [[var if val else -var]], copy.copy(a))
+
+    return islice(models(clauses, {}), limit)
@@ -0,0 +1,247 @@
+from typing import List, Optional, Tuple
+
+class DratWriter:
+    """
+    Buffered DRAT proof output. Binary DRAT by default ('a'/'d' tag,
+    then variable-length literals, then 0); text DRAT with binary=False.
+    """
+    def __init__(self, path: str, binary: bool = True, buffer_size: int = 1 << 16):
+        self.f = open(path, 'wb')
+        self.binary = binary
+        self.buffer_size = buffer_size
+        self.buf = bytearray()
+
+    def _emit(self, tag: bytes, lits: List[int]):
+        buf = self.buf
+        if self.binary:
+            buf += tag
+            for l in lits:
+                u = 2 * abs(l) + (l < 0)
+                while u > 127:
+                    buf.append(u & 127 | 128)
+                    u >>= 7
+                buf.append(u)
+            buf.append(0)
+        else:
+            if tag == b'd':
+                buf += b'd '
+            buf += (" ".join(map(str, lits)) + (" 0\n" if lits else "0\n")).encode()
+        if len(buf) >= self.buffer_size:
+            self.flush()
+
+    def add(self, lits: List[int]):
+        self._emit(b'a', lits)
+
+    def delete(self, lits: List[int]):
+        self._emit(b'd', lits)
+
+    def flush(self):
+        self.f.write(self.buf)
+        self.buf.clear()
+
+    def close(self):
+        self.flush()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_drat(path: str) -> List[Tuple[bool, List[int]]]:
+    """Returns the proof as (is_deletion, literals) steps; binary is auto-detected."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    steps = []
+    if data[:1] in (b'a', b'd') and any(b not in b' -0123456789d\n\r\t' for b in data[:64]):
+        i = 0
+        while i < len(data):
+            is_del = data[i] == 0x64
+            i += 1
+            lits, u, shift = [], 0, 0
+            while True:
+                b = data[i]; i += 1
+                u |= (b & 127) << shift
+                shift += 7
+                if b < 128:
+                    if u == 0:
+                        break
+                    lits.append(-(u >> 1) if u & 1 else u >> 1)
+                    u, shift = 0, 0
+            steps.append((is_del, lits))
+    else:
+        for line in data.decode().splitlines():
+            parts = line.split()
+            if not parts or parts[0] == 'c':
+                continue
+            is_del = parts[0] == 'd'
+            lits = [int(x) for x in parts[is_del:]]
+            if lits and lits[-1] == 0:
+                lits.pop()
+            steps.append((is_del, lits))
+    return steps
+
+class _ClauseDB:
+    def __init__(self):
+        self.clauses: List[List[int]] = []
+        self.active: List[bool] = []
+        self.occ = {}
+        self.units = set()
+        self.by_key = {}
+
+    def add(self, lits: List[int]) -> int:
+        cid = len(self.clauses)
+        self.clauses.append(lits)
+        self.active.append(False)
+        self.by_key.setdefault(frozenset(lits), []).append(cid)
+        self.activate(cid)
+        return cid
+
+    def activate(self, cid: int):
+        self.active[cid] = True
+        lits = self.clauses[cid]
+        for l in lits:
+            self.occ.setdefault(l, set()).add(cid)
+        if len(lits) == 1:
+            self.units.add(cid)
+
+    def deactivate(self, cid: int):
+        self.active[cid] = False
+        for l in self.clauses[cid]:
+            self.occ[l].discard(cid)
+        self.units.discard(cid)
+
+    def find(self, lits: List[int]) -> Optional[int]:
+        for cid in reversed(self.by_key.get(frozenset(lits), ())):
+            if self.active[cid]:
+                return cid
+        return None
+
+    def rup(self, lemma: List[int]):
+        """Reverse unit propagation. Returns the clause ids used, or None if it fails."""
+        true = set()
+        reason = {}
+        queue = []
+
+        def assign(l, cid):
+            true.add(l)
+            reason[abs(l)] = cid
+            queue.append(l)
+
+        for l in lemma:
+            if l in true:
+                continue
+            if -l in true:
+                return set()          # tautology
+            assign(-l, None)
+        for cid in self.units:
+            l = self.clauses[cid][0]
+            if -l in true:
+                return self._used(cid, reason)
+            if l not in true:
+                assign(l, cid)
+
+        while queue:
+            l = queue.pop()
+            for cid in self.occ.get(-l, ()):
+                unassigned = None
+                satisfied = False
+                for x in self.clauses[cid]:
+                    if x in true:
+                        satisfied = True
+                        break
+                    if -x not in true:
+                        if unassigned is not None:
+                            break
+                        unassigned = x
+                else:
+                    if unassigned is None:
+                        return self._used(cid, reason)
+                    assign(unassigned, cid)
+                    continue
+                if satisfied:
+                    continue
+        return None
+
+    def _used(self, conflict: int, reason) -> set:
+        used, stack, seen = set(), [conflict], set()
+        while stack:
+            cid = stack.pop()
+            if cid in used:
+                continue
+            used.add(cid)
+            for x in self.clauses[cid]:
+                v = abs(x)
+                if v not in seen and reason.get(v) is not None:
+                    seen.add(v)
+                    stack.append(reason[v])
+        return used
+
+    def rat(self, lemma: List[int]):
+        """RAT on the first literal; returns the clause ids used, or None."""
+        if not lemma:
+            return None
+        pivot = lemma[0]
+        used = set()
+        for cid in list(self.occ.get(-pivot, ())):
+            r = self.rup(lemma + [x for x in self.clauses[cid] if x != -pivot])
+            if r is None:
+                return None
+            used |= r | {cid}
+        return used
+
+    def implied(self, lemma: List[int]):
+        r = self.rup(lemma)
+        return r if r is not None else self.rat(lemma)
+
+def check_drat(clauses: List[List[int]], proof_path: str, backward: bool = True) -> bool:
+    """
+    Checks that a DRAT proof refutes `clauses`. Forward mode checks
+    every lemma when it is added. Backward mode replays the proof up
+    to the empty clause, then checks only the lemmas that the
+    refutation actually depends on.
+    Unit deletions are ignored, as in drat-trim.
+    """
+    if any(not c for c in clauses):
+        return True
+    db = _ClauseDB()
+    # Repeated literals are merged so such clauses still become unit
+    for c in clauses:
+        db.add(list(dict.fromkeys(c)))
+    steps = read_drat(proof_path)
+
+    trace = []                       # (is_deletion, clause id)
+    for is_del, lits in steps:
+        if is_del:
+            if len(lits) == 1:
+                continue
+            cid = db.find(lits)
+            if cid is not None:
+                db.deactivate(cid)
+                trace.append((True, cid))
+            continue
+        if not backward and db.implied(lits) is None:
+            return False
+        cid = db.add(lits)
+        trace.append((False, cid))
+        if not lits:
+            break
+    else:
+        return any(not c for c in clauses)
+
+    if not backward:
+        return True
+
+    marked = {trace[-1][1]}
+    for is_del, cid in reversed(trace):
+        if is_del:
+            db.activate(cid)
+            continue
+        db.deactivate(cid)
+        if cid in marked:
+            used = db.implied(db.clauses[cid])
+            if used is None:
+                return False
+            marked |= used
+    return True
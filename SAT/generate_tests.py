@@ -1,29 +1,92 @@
 import os
+import sys
+import gzip
 import random
+import argparse
+from math import comb
+from itertools import combinations
 
-def generate_random_3sat(filename, num_vars, num_clauses):
+BUFFER_CLAUSES = 65536
+
+def write_cnf(filename, num_vars, num_clauses, clauses, comment):
     """
-    Generates a Random 3-SAT problem near the phase transition.
-    Ratio ~4.26 is the 'hardest' region for SAT solvers.
+    Streams clauses to a DIMACS file in buffered chunks. The clause
+    count must be known up front for the header. Files ending in .gz
+    are gzip-compressed.
     """
-    with open(filename, 'w') as f:
-        f.write(f"c Random 3-SAT generated for Python Benchmarking\n")
+    if filename.endswith('.gz'):
+        f = gzip.open(filename, 'wt', compresslevel=6)
+    else:
+        f = open(filename, 'w', buffering=1 << 20)
+    with f:
+        f.write(f"c {comment}\n")
         f.write(f"p cnf {num_vars} {num_clauses}\n")
-        
-        used_clauses = set()
-        
-        while len(used_clauses) < num_clauses:
-            # Pick 3 distinct variables
-            vars = random.sample(range(1, num_vars + 1), 3)
-            # Randomly negate them
-            literals = [v * random.choice([1, -1]) for v in vars]
-            
-            # Create immutable tuple for set storage
-            clause_tuple = tuple(sorted(literals, key=abs))
-            
-            if clause_tuple not in used_clauses:
-                used_clauses.add(clause_tuple)
-                f.write(f"{literals[0]} {literals[1]} {literals[2]} 0\n")
+        buf = []
+        for c in clauses:
+            buf.append(" ".join(map(str, c)) + " 0\n")
+            if len(buf) >= BUFFER_CLAUSES:
+                f.write("".join(buf))
+                buf.clear()
+        f.write("".join(buf))
+
+def random_ksat(num_vars, num_clauses, k=3, rng=random, dedup=True, planted=None):
+    """
+    Returns an iterator of random k-clauses over distinct variables. With
+    `planted` (a list of bools, index 0 unused), clauses falsified by that
+    assignment are rejected, so the formula is guaranteed SAT. Raises
+    ValueError up front when the clauses asked for cannot all be drawn.
+    """
+    if not 1 <= k <= num_vars:
+        raise ValueError(f"k must be between 1 and the number of variables ({num_vars}), got {k}")
+    if dedup:
+        # Each set of k variables has 2^k sign patterns, one of them
+        # falsified by the planted assignment
+        available = comb(num_vars, k) * ((1 << k) - (planted is not None))
+        if num_clauses > available:
+            raise ValueError(f"{num_clauses} distinct {k}-clauses requested, "
+                             f"but only {available} exist over {num_vars} variables")
+    return _ksat_clauses(num_vars, num_clauses, k, rng, dedup, planted)
+
+def _ksat_clauses(num_vars, num_clauses, k, rng, dedup, planted):
+    used = set() if dedup else None
+    randrange, getrandbits = rng.randrange, rng.getrandbits
+    made = 0
+    while made < num_clauses:
+        # Pick k distinct variables and negate them at random
+        vars = []
+        while len(vars) < k:
+            v = randrange(1, num_vars + 1)
+            if v not in vars:
+                vars.append(v)
+        signs = getrandbits(k)
+        literals = [-v if signs >> i & 1 else v for i, v in enumerate(vars)]
+        if planted is not None and not any(planted[abs(l)] == (l > 0) for l in literals):
+            continue
+        if used is not None:
+            key = tuple(sorted(literals, key=abs))
+            if key in used:
+                continue
+            used.add(key)
+        made += 1
+        yield literals
+
+def generate_random_3sat(filename, num_vars, num_clauses, k=3, seed=None, dedup=True):
+    """
+    Generates a Random k-SAT problem (3-SAT by default).
+    Ratio ~4.26 is the 'hardest' region for 3-SAT solvers.
+    """
+    rng = random.Random(seed)
+    write_cnf(filename, num_vars, num_clauses,
+              random_ksat(num_vars, num_clauses, k, rng, dedup),
+              f"Random {k}-SAT generated for Python Benchmarking (seed {seed})")
+
+def generate_planted(filename, num_vars, num_clauses, k=3, seed=None):
+    """Random k-SAT with a hidden solution: always satisfiable."""
+    rng = random.Random(seed)
+    planted = [False] + [rng.random() < 0.5 for _ in range(num_vars)]
+    write_cnf(filename, num_vars, num_clauses,
+              random_ksat(num_vars, num_clauses, k, rng, False, planted),
+              f"Planted {k}-SAT (seed {seed})")
 
 def generate_pigeonhole(filename, pigeons, holes):
     """
@@ -31,69 +94,165 @@ def generate_pigeonhole(filename, pigeons, holes):
     If P > H, this is UNSATISFIABLE, but hard to prove.
     """
     num_vars = pigeons * holes
-    
+
     # Helper to get var index (1-based)
     def get_var(p, h): # p=1..P, h=1..H
         return (p - 1) * holes + h
 
-    clauses = []
+    def clauses():
+        # 1. Each pigeon must be in at least one hole
+        for p in range(1, pigeons + 1):
+            yield [get_var(p, h) for h in range(1, holes + 1)]
 
-    # 1. Each pigeon must be in at least one hole
-    for p in range(1, pigeons + 1):
-        clause = []
+        # 2. No hole can have two pigeons (Conflict)
         for h in range(1, holes + 1):
-            clause.append(get_var(p, h))
-        clauses.append(clause)
-
-    # 2. No hole can have two pigeons (Conflict)
-    for h in range(1, holes + 1):
-        for p1 in range(1, pigeons + 1):
-            for p2 in range(p1 + 1, pigeons + 1):
+            for p1, p2 in combinations(range(1, pigeons + 1), 2):
                 # Not (p1 in h AND p2 in h)  ==  (Not p1 in h OR Not p2 in h)
-                clauses.append([-get_var(p1, h), -get_var(p2, h)])
+                yield [-get_var(p1, h), -get_var(p2, h)]
 
-    with open(filename, 'w') as f:
-        f.write(f"c Pigeonhole Principle {pigeons} pigeons in {holes} holes\n")
-        f.write(f"p cnf {num_vars} {len(clauses)}\n")
-        for c in clauses:
-            f.write(" ".join(map(str, c)) + " 0\n")
+    num_clauses = pigeons + holes * pigeons * (pigeons - 1) // 2
+    write_cnf(filename, num_vars, num_clauses, clauses(),
+              f"Pigeonhole Principle {pigeons} pigeons in {holes} holes")
+
+def generate_coloring(filename, nodes, edges, colors, seed=None):
+    """
+    K-colouring of a random graph with `nodes` vertices and `edges`
+    distinct edges. Variable (v, c) is true when vertex v gets colour c.
+    """
+    if edges > nodes * (nodes - 1) // 2:
+        raise ValueError(f"a simple graph on {nodes} vertices has at most "
+                         f"{nodes * (nodes - 1) // 2} edges, got {edges}")
+    rng = random.Random(seed)
+    graph = set()
+    while len(graph) < edges:
+        u, v = rng.sample(range(nodes), 2)
+        graph.add((min(u, v), max(u, v)))
+
+    def var(v, c):
+        return v * colors + c + 1
+
+    def clauses():
+        for v in range(nodes):
+            yield [var(v, c) for c in range(colors)]
+            for c1, c2 in combinations(range(colors), 2):
+                yield [-var(v, c1), -var(v, c2)]
+        for u, v in graph:
+            for c in range(colors):
+                yield [-var(u, c), -var(v, c)]
+
+    num_clauses = nodes * (1 + colors * (colors - 1) // 2) + edges * colors
+    write_cnf(filename, nodes * colors, num_clauses, clauses(),
+              f"{colors}-colouring of random graph n={nodes} m={edges} (seed {seed})")
 
-def main():
-    output_dir = "SAT_Dataset"
+def xor_clauses(a, b, c):
+    """CNF for c == a XOR b."""
+    return [[-a, -b, -c], [a, b, -c], [a, -b, c], [-a, b, c]]
+
+def generate_parity(filename, n, seed=None, unsat=False):
+    """
+    Parity chain: aux variables t_i = x_1 XOR ... XOR x_i, with the
+    final one fixed to a random parity. With `unsat`, a second chain over
+    a shuffled order of the same variables demands the opposite parity.
+    """
+    rng = random.Random(seed)
+    parity = rng.random() < 0.5
+    chains = [list(range(1, n + 1))]
+    if unsat:
+        order = chains[0][:]
+        rng.shuffle(order)
+        chains.append(order)
+
+    def clauses():
+        next_var = n + 1
+        for i, order in enumerate(chains):
+            prev = order[0]
+            for x in order[1:]:
+                yield from xor_clauses(prev, x, next_var)
+                prev = next_var
+                next_var += 1
+            want = parity if i == 0 else not parity
+            yield [prev if want else -prev]
+
+    num_vars = n + len(chains) * (n - 1)
+    num_clauses = len(chains) * (4 * (n - 1) + 1)
+    write_cnf(filename, num_vars, num_clauses, clauses(),
+              f"Parity chain n={n}{' (UNSAT)' if unsat else ''} (seed {seed})")
+
+def generate_dataset(output_dir="SAT_Dataset", seed=None):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
-    
-    print(f"Generating 20 benchmark files in '{output_dir}'...")
 
-    # --- Set 1: Random 3-SAT (N=30) [EASY] ---
-    # Ratio 4.26 -> ~128 clauses
-    for i in range(1, 6):
-        generate_random_3sat(f"{output_dir}/rnd_n30_0{i}.cnf", 30, 128)
-
-    # --- Set 2: Random 3-SAT (N=50) [MEDIUM] ---
-    # Ratio 4.26 -> ~213 clauses
-    for i in range(1, 6):
-        generate_random_3sat(f"{output_dir}/rnd_n50_0{i}.cnf", 50, 213)
+    print(f"Generating 20 benchmark files in '{output_dir}'...")
 
-    # --- Set 3: Random 3-SAT (N=75) [HARD] ---
-    # Ratio 4.26 -> ~320 clauses
-    # These might still timeout Naive, but DPLL should sweat
-    for i in range(1, 6):
-        generate_random_3sat(f"{output_dir}/rnd_n75_0{i}.cnf", 75, 320)
+    # --- Set 1-3: Random 3-SAT (N=30/50/75) [EASY/MEDIUM/HARD] ---
+    # Ratio 4.26 -> ~128/213/320 clauses
+    for n, m in ((30, 128), (50, 213), (75, 320)):
+        for i in range(1, 6):
+            s = None if seed is None else seed * 1000 + n * 10 + i
+            generate_random_3sat(f"{output_dir}/rnd_n{n}_0{i}.cnf", n, m, seed=s)
 
     # --- Set 4: Pigeonhole Principle (Logic Test) ---
-    # PHP 4-3 (12 vars) - Easy
-    generate_pigeonhole(f"{output_dir}/php_4_3.cnf", 4, 3)
-    # PHP 5-4 (20 vars) - Medium
-    generate_pigeonhole(f"{output_dir}/php_5_4.cnf", 5, 4)
-    # PHP 6-5 (30 vars) - Hard (Exponentially harder for resolution)
-    generate_pigeonhole(f"{output_dir}/php_6_5.cnf", 6, 5)
-    # PHP 7-6 (42 vars) - Very Hard
-    generate_pigeonhole(f"{output_dir}/php_7_6.cnf", 7, 6)
-    # PHP 8-7 (56 vars) - Extreme
-    generate_pigeonhole(f"{output_dir}/php_8_7.cnf", 8, 7)
+    # PHP 4-3 (12 vars) - Easy ... PHP 8-7 (56 vars) - Extreme
+    for p in range(4, 9):
+        generate_pigeonhole(f"{output_dir}/php_{p}_{p-1}.cnf", p, p - 1)
 
     print("Done! You can now run the benchmark script.")
 
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate DIMACS CNF benchmark instances.")
+    sub = ap.add_subparsers(dest="kind")
+
+    d = sub.add_parser("dataset", help="regenerate the fixed SAT_Dataset files")
+    d.add_argument("--dir", default="SAT_Dataset")
+    d.add_argument("--seed", type=int)
+
+    r = sub.add_parser("rnd", help="random k-SAT")
+    r.add_argument("-n", "--vars", type=int, required=True)
+    r.add_argument("-m", "--clauses", type=int)
+    r.add_argument("--ratio", type=float, default=4.26, help="clauses per variable when -m is not given")
+    r.add_argument("-k", type=int, default=3)
+    r.add_argument("--no-dedup", action="store_true", help="skip duplicate-clause filtering (no clause set in memory)")
+    r.add_argument("--planted", action="store_true", help="hide a solution so the instance is SAT")
+
+    p = sub.add_parser("php", help="pigeonhole principle")
+    p.add_argument("--pigeons", type=int, required=True)
+    p.add_argument("--holes", type=int)
+
+    g = sub.add_parser("color", help="random graph colouring")
+    g.add_argument("--nodes", type=int, required=True)
+    g.add_argument("--edges", type=int, required=True)
+    g.add_argument("--colors", type=int, default=3)
+
+    x = sub.add_parser("parity", help="XOR/parity chains")
+    x.add_argument("-n", "--vars", type=int, required=True)
+    x.add_argument("--unsat", action="store_true")
+
+    for s in (r, p, g, x):
+        s.add_argument("-o", "--output", required=True, help="output file (.cnf or .cnf.gz)")
+    for s in (r, g, x):
+        s.add_argument("--seed", type=int)
+
+    args = ap.parse_args(argv)
+    try:
+        generate(args)
+    except ValueError as e:
+        ap.error(str(e))
+
+def generate(args):
+    if args.kind in (None, "dataset"):
+        generate_dataset(getattr(args, "dir", "SAT_Dataset"), getattr(args, "seed", None))
+    elif args.kind == "rnd":
+        m = args.clauses if args.clauses is not None else round(args.ratio * args.vars)
+        if args.planted:
+            generate_planted(args.output, args.vars, m, args.k, args.seed)
+        else:
+            generate_random_3sat(args.output, args.vars, m, args.k, args.seed, not args.no_dedup)
+    elif args.kind == "php":
+        generate_pigeonhole(args.output, args.pigeons, args.holes or args.pigeons - 1)
+    elif args.kind == "color":
+        generate_coloring(args.output, args.nodes, args.edges, args.colors, args.seed)
+    elif args.kind == "parity":
+        generate_parity(args.output, args.vars, args.seed, args.unsat)
+
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,102 @@
+import random
+import time
+
+def solve_walksat(clauses, num_vars, max_flips=100000, restarts=10, max_time=None,
+                  seed=None, method="walksat", noise=0.5, cb=2.3, budget=None):
+    """
+    Stochastic local search (WalkSAT/SKC or probSAT). Incomplete:
+    returns a model, or None once the flip/time budget runs out, which
+    does NOT mean the formula is UNSAT. With a Budget, each flip counts
+    as a decision.
+    """
+    rng = random.Random(seed)
+    deadline = time.time() + max_time if max_time is not None else None
+
+    # Drop duplicate literals and tautologies so the counters stay exact
+    cls = []
+    for clause in clauses:
+        c = list(dict.fromkeys(clause))
+        if any(-l in c for l in c):
+            continue
+        if not c:
+            return None
+        cls.append(c)
+
+    # occ[l] holds the clauses containing literal l; negative l wraps
+    # around into the upper half of the list
+    occ = [[] for _ in range(2 * num_vars + 1)]
+    for i, c in enumerate(cls):
+        for l in c:
+            occ[l].append(i)
+
+    n_cls = len(cls)
+    weights = [(0.9 + b) ** -cb for b in range(64)]
+
+    for _ in range(restarts):
+        val = [False] + [rng.random() < 0.5 for _ in range(num_vars)]
+        true_count = [0] * n_cls
+        crit = [0] * n_cls          # xor of true vars; the critical var when count == 1
+        brk = [0] * (num_vars + 1)  # clauses that flipping v would break
+        unsat = []
+        pos = [-1] * n_cls
+
+        for i, c in enumerate(cls):
+            for l in c:
+                if val[abs(l)] == (l > 0):
+                    true_count[i] += 1
+                    crit[i] ^= abs(l)
+            if true_count[i] == 0:
+                pos[i] = len(unsat)
+                unsat.append(i)
+            elif true_count[i] == 1:
+                brk[crit[i]] += 1
+
+        for flips in range(max_flips):
+            if not unsat:
+                return {v: val[v] for v in range(1, num_vars + 1)}
+            if deadline is not None and flips & 1023 == 0 and time.time() > deadline:
+                return None
+            if budget is not None:
+                budget.decision()
+
+            c = cls[unsat[rng.randrange(len(unsat))]]
+            if method == "probsat":
+                ws = [weights[min(brk[abs(l)], 63)] for l in c]
+                v = abs(rng.choices(c, ws)[0])
+            else:
+                breaks = [brk[abs(l)] for l in c]
+                best = min(breaks)
+                if best > 0 and rng.random() < noise:
+                    v = abs(rng.choice(c))
+                else:
+                    v = abs(c[breaks.index(best)])
+
+            val[v] = not val[v]
+            made = v if val[v] else -v
+
+            for i in occ[made]:
+                true_count[i] += 1
+                crit[i] ^= v
+                if true_count[i] == 1:
+                    last = unsat.pop()
+                    if last != i:
+                        unsat[pos[i]] = last
+                        pos[last] = pos[i]
+                    pos[i] = -1
+                    brk[v] += 1
+                elif true_count[i] == 2:
+                    brk[crit[i] ^ v] -= 1
+
+            for i in occ[-made]:
+                true_count[i] -= 1
+                crit[i] ^= v
+                if true_count[i] == 0:
+                    pos[i] = len(unsat)
+                    unsat.append(i)
+                    brk[v] -= 1
+                elif true_count[i] == 1:
+                    brk[crit[i]] += 1
+
+        if not unsat:
+            return {v: val[v] for v in range(1, num_vars + 1)}
+    return None
@@ -0,0 +1,228 @@
+class LookaheadSolver:
+    """
+    March-style lookahead DPLL. At every node each free variable is probed
+    both ways: a probe that propagates to a conflict is a failed literal
+    and its complement is asserted; otherwise the probe is scored by the
+    clauses it shrinks without satisfying (weight 1 for a new binary, 1/5
+    for a new ternary, and so on). The node branches on the variable with
+    the largest diff(x) * diff(-x), less reducing side first. With
+    double=True, probes that shrink many clauses get a second, shallow
+    lookahead that can expose failed literals one level deeper.
+    """
+    def __init__(self, clauses, num_vars, double=False, budget=None,
+                 double_min=2.0, double_candidates=8):
+        self.num_vars = n = max([num_vars] + [abs(l) for c in clauses for l in c])
+        self.double = double
+        self.double_min = double_min
+        self.double_candidates = double_candidates
+        self.budget = budget
+        self.clauses = []
+        self.empty = False
+        for c in clauses:
+            c = list(dict.fromkeys(c))
+            if any(-l in c for l in c):
+                continue
+            if not c:
+                self.empty = True
+            self.clauses.append(c)
+
+        # occ[l] lists the clauses containing literal l; val[l] is 1 / -1 / 0
+        # for true / false / unassigned. Negative l wraps into the upper half.
+        self.occ = [[] for _ in range(2 * n + 1)]
+        for ci, c in enumerate(self.clauses):
+            for l in c:
+                self.occ[l].append(ci)
+        self.val = [0] * (2 * n + 1)
+        self.free = [len(c) for c in self.clauses]
+        self.sat = [0] * len(self.clauses)
+        self.num_sat = 0
+        self.trail = []
+        self.qhead = 0
+        self.path = []
+
+        longest = max([len(c) for c in self.clauses] + [2])
+        self.weight = [0.0, 0.0] + [5.0 ** (2 - k) for k in range(2, longest + 1)]
+        self.order = sorted(range(1, n + 1), key=lambda v: -len(self.occ[v]) - len(self.occ[-v]))
+
+    def assign(self, lit):
+        val, sat = self.val, self.sat
+        val[lit] = 1
+        val[-lit] = -1
+        self.trail.append(lit)
+        for ci in self.occ[lit]:
+            if not sat[ci]:
+                self.num_sat += 1
+            sat[ci] += 1
+        for ci in self.occ[-lit]:
+            self.free[ci] -= 1
+
+    def undo(self, mark):
+        val, sat, free, trail = self.val, self.sat, self.free, self.trail
+        while len(trail) > mark:
+            lit = trail.pop()
+            val[lit] = val[-lit] = 0
+            for ci in self.occ[lit]:
+                sat[ci] -= 1
+                if not sat[ci]:
+                    self.num_sat -= 1
+            for ci in self.occ[-lit]:
+                free[ci] += 1
+        self.qhead = min(self.qhead, mark)
+
+    def propagate(self):
+        """Unit propagation from the unprocessed part of the trail; False on conflict."""
+        val, sat, free, clauses, trail = self.val, self.sat, self.free, self.clauses, self.trail
+        while self.qhead < len(trail):
+            lit = trail[self.qhead]
+            self.qhead += 1
+            for ci in self.occ[-lit]:
+                if sat[ci]:
+                    continue
+                if not free[ci]:
+                    return False
+                if free[ci] == 1:
+                    for l in clauses[ci]:
+                        if not val[l]:
+                            self.assign(l)
+                            break
+        return True
+
+    def probe(self, lit, deep=True):
+        """Returns the reduction score of asserting lit, or None if it fails."""
+        mark = len(self.trail)
+        self.assign(lit)
+        if not self.propagate():
+            self.undo(mark)
+            return None
+        sat, free, weight = self.sat, self.free, self.weight
+        shrunk = set()
+        for l in self.trail[mark:]:
+            for ci in self.occ[-l]:
+                if not sat[ci]:
+                    shrunk.add(ci)
+        diff = sum(weight[free[ci]] for ci in shrunk)
+        if deep and self.double and diff >= self.double_min and self.double_look():
+            diff = None
+        self.undo(mark)
+        return diff
+
+    def double_look(self):
+        # Inside a probe: a variable failing both ways means the probe fails
+        tried = 0
+        for v in self.order:
+            if self.val[v]:
+                continue
+            if self.probe(v, False) is None and self.probe(-v, False) is None:
+                return True
+            tried += 1
+            if tried == self.double_candidates:
+                break
+        return False
+
+    def assert_lit(self, lit):
+        self.assign(lit)
+        return self.propagate()
+
+    def lookahead(self):
+        """
+        Probes every free variable, asserting failed literals until none is
+        left. Returns the branch literal, 0 when every clause is satisfied,
+        or None when the node is refuted.
+        """
+        while True:
+            best, best_score, failed = 0, -1.0, False
+            for v in self.order:
+                if self.val[v] or self.num_sat == len(self.clauses):
+                    continue
+                # One node can probe every variable, so the clock is
+                # checked per probe, not only per node
+                if self.budget is not None:
+                    self.budget.tick()
+                pos = self.probe(v)
+                if pos is None:
+                    failed = True
+                    if not self.assert_lit(-v):
+                        return None
+                    continue
+                neg = self.probe(-v)
+                if neg is None:
+                    failed = True
+                    if not self.assert_lit(v):
+                        return None
+                    continue
+                score = 1024 * pos * neg + pos + neg
+                if score > best_score:
+                    best, best_score = (v if pos <= neg else -v), score
+            if not failed:
+                return best if self.num_sat < len(self.clauses) else 0
+
+    def node(self):
+        """Propagates and looks ahead at the current node; same results as lookahead()."""
+        if self.budget is not None:
+            self.budget.decision()
+        if not self.propagate():
+            return None
+        return self.lookahead()
+
+    def search(self):
+        lit = self.node()
+        if lit is None:
+            if self.budget is not None:
+                self.budget.conflict()
+            return False
+        if not lit:
+            return True
+        mark = len(self.trail)
+        for d in (lit, -lit):
+            self.path.append(d)
+            self.assign(d)
+            if self.search():
+                return True
+            self.path.pop()
+            self.undo(mark)
+        return False
+
+    def model(self):
+        return {v: self.val[v] != -1 for v in range(1, self.num_vars + 1)}
+
+    def solve(self):
+        if self.empty:
+            return None
+        return self.model() if self.search() else None
+
+    def emit_cubes(self, depth, path=None):
+        """
+        Splits with the lookahead heuristic down to `depth` decisions and
+        returns the frontier as cubes (lists of decision literals). Refuted
+        branches are dropped, so an empty list means UNSAT; a leaf where
+        every clause is already satisfied is kept as a cube. With `path`,
+        the cubes are also written there as "a <lits> 0" lines.
+        """
+        cubes = []
+
+        def split(d):
+            lit = self.node()
+            if lit is None:
+                return
+            if not lit or d == depth:
+                cubes.append(list(self.path))
+                return
+            mark = len(self.trail)
+            for b in (lit, -lit):
+                self.path.append(b)
+                self.assign(b)
+                split(d + 1)
+                self.path.pop()
+                self.undo(mark)
+
+        if not self.empty:
+            split(0)
+            self.undo(0)
+        if path is not None:
+            with open(path, "w") as f:
+                for cube in cubes:
+                    f.write("a " + " ".join(map(str, cube)) + " 0\n")
+        return cubes
+
+def solve_lookahead(clauses, num_vars, budget=None, double=False):
+    return LookaheadSolver(clauses, num_vars, double, budget).solve()
@@ -1,52 +1,93 @@
-import os, glob, time, multiprocessing
-from parsing import parse_dimacs_cnf, verify_solution
+import os, sys, glob, time, tempfile
+from parsing import parse_dimacs_cnf
+from verify import FlatCNF
+from budget import Budget, solve_with_budget, SAT, UNSAT, UNKNOWN
+from cache import ResultCache, formula_key, _MISSING
+from drat import DratWriter, check_drat
 from naive import solve_naive
 from degree_heuristic import solve_degree_heuristic
 from dpll import solve_dpll
-from backjumping import solve_backjumping
+from codegen import solve_dpll_compiled
+from backjumping import solve_backjumping, solve_backjumping_up
+from lookahead import solve_lookahead
+from cube_conquer import solve_cube_and_conquer
+from portfolio import solve_portfolio
+from local_search import solve_walksat
+from symmetry import solve_with_symmetry_breaking
 
-def worker(solver, clauses, n, ret):
-    try:
-        start = time.time()
-        sol = solver(clauses, n)
-        ret['time'] = time.time() - start
-        ret['result'] = sol
-    except Exception as e:
-        ret['error'] = str(e)
+def run_solver(solver, clauses, n, budget, complete=True, proof_path=None):
+    """Runs one solver in-process under `budget`; returns (status, model, seconds)."""
+    start = time.time()
+    if proof_path:
+        with DratWriter(proof_path) as proof:
+            status, sol = solve_with_budget(solver, clauses, n, budget, complete, proof=proof)
+    else:
+        status, sol = solve_with_budget(solver, clauses, n, budget, complete)
+    return status, sol, time.time() - start
 
-def run_benchmark():
+def run_benchmark(certify=False, cache_path=None):
     TIMEOUT = 30
     files = sorted(glob.glob("SAT_Dataset/*.cnf"))
     solvers = {
         "Naive": solve_naive,
         "Degree": solve_degree_heuristic,
         "DPLL": solve_dpll,
-        "Backjump": solve_backjumping
+        "DPLL-JIT": solve_dpll_compiled,
+        "Backjump": solve_backjumping,
+        "CBJ-UP": solve_backjumping_up,
+        "Lookahead": solve_lookahead,
+        "Cube&Conquer": solve_cube_and_conquer,
+        "Portfolio": solve_portfolio,
+        "WalkSAT": solve_walksat,
+        "DPLL+SB": solve_with_symmetry_breaking
     }
+    # Solvers run in-process and stop cooperatively once the budget is spent.
+    # Incomplete solvers cannot prove UNSAT; no model means UNKNOWN
+    incomplete = {"WalkSAT"}
+    # Solvers that can write DRAT proofs for UNSAT results
+    proof_capable = {"DPLL", "Backjump", "CBJ-UP"}
+    # Results of complete solvers are reused across reruns, keyed per solver
+    cache = ResultCache(path=cache_path) if cache_path else None
 
     for f in files:
         print(f"\nFile: {os.path.basename(f)}")
         clauses, n = parse_dimacs_cnf(f)
         print(f"Vars: {n}, Clauses: {len(clauses)}")
+        checker = FlatCNF(clauses, n)
 
         for name, solver in solvers.items():
-            manager = multiprocessing.Manager()
-            ret = manager.dict()
-            p = multiprocessing.Process(target=worker, args=(solver, clauses, n, ret))
-            p.start()
-            p.join(TIMEOUT)
+            cached = cache is not None and name not in incomplete
+            key = formula_key(clauses, n, namespace=name) if cached else None
+            res = cache.get(key) if cached else _MISSING
+            if res is not _MISSING:
+                print(f"  {name}: {'SAT' if res else 'UNSAT'} (cached)")
+                continue
+            proof_path = None
+            if certify and name in proof_capable:
+                proof_path = os.path.join(tempfile.gettempdir(), f"{os.path.basename(f)}.{name}.drat")
+            budget = Budget(time_limit=TIMEOUT)
+            try:
+                status, res, t = run_solver(solver, clauses, n, budget, name not in incomplete, proof_path)
+            except Exception as e:
+                print(f"  {name}: ERROR {e}")
+                status = None
 
-            if p.is_alive():
-                p.terminate()
-                print(f"  {name}: TIMEOUT")
-            elif 'error' in ret:
-                print(f"  {name}: ERROR {ret['error']}")
-            else:
-                t = ret['time']
-                res = ret['result']
-                status = "SAT" if res else "UNSAT"
-                valid = verify_solution(clauses, res) if res else True
+            if status == UNKNOWN and budget.reason:
+                print(f"  {name}: TIMEOUT ({budget.decisions} decisions, {budget.conflicts} conflicts)")
+            elif status is not None:
+                valid = checker.satisfies(res) if status == SAT else True
+                if proof_path and status == UNSAT:
+                    valid = check_drat(clauses, proof_path)
                 print(f"  {name}: {status} in {t:.4f}s [{ 'Valid' if valid else 'INVALID'} ]")
+                if cached and status != UNKNOWN and valid:
+                    cache.put(key, res)
+            if proof_path and os.path.exists(proof_path):
+                os.remove(proof_path)
+
+    if cache is not None:
+        print(f"\nCache: {cache.stats()}")
+        cache.close()
 
 if __name__ == "__main__":
-    run_benchmark()
+    cache_path = sys.argv[sys.argv.index("--cache") + 1] if "--cache" in sys.argv else None
+    run_benchmark(certify="--certify" in sys.argv, cache_path=cache_path)
@@ -1,30 +1,74 @@
-import copy
+def solve_naive(clauses, num_vars, budget=None):
+    if any(not c for c in clauses):
+        return None
+    m = len(clauses)
+
+    # occ[v] lists (clause, positive, negative occurrences of v); a clause
+    # is active until satisfied, and free[i] counts its literals whose
+    # variable is still unassigned
+    occ = [[] for _ in range(max([num_vars] + [abs(l) for c in clauses for l in c]) + 1)]
+    for i, clause in enumerate(clauses):
+        counts = {}
+        for lit in clause:
+            counts.setdefault(abs(lit), [0, 0])[lit < 0] += 1
+        for v, (p, n) in counts.items():
+            occ[v].append((i, p, n))
+    active = [True] * m
+    free = [len(c) for c in clauses]
+    a = {}
+    first = 0  # index of the first active clause
 
-def solve_naive(clauses, num_vars):
-    def simplify(current, var, val):
-        new = []
-        for clause in current:
-            if (var in clause and val) or (-var in clause and not val):
+    def simplify(var, val):
+        # Deactivates the clauses var satisfies and shrinks the others;
+        # returns (no clause emptied, deactivated clauses) for unsimplify
+        ok = True
+        removed = []
+        for i, p, n in occ[var]:
+            if not active[i]:
                 continue
-            new_clause = [lit for lit in clause if abs(lit) != var]
-            if not new_clause:
-                return None
-            new.append(new_clause)
-        return new
+            if p if val else n:
+                active[i] = False
+                removed.append(i)
+            else:
+                free[i] -= p + n
+                if not free[i]:
+                    ok = False
+        return ok, removed
 
-    def backtrack(c, a):
-        if not c:
+    def unsimplify(var, removed):
+        for i, p, n in occ[var]:
+            if active[i]:
+                free[i] += p + n
+        for i in removed:
+            active[i] = True
+
+    def backtrack():
+        nonlocal first
+        if first == m:
             return a
-        
-        lit = c[0][0]
-        var = abs(lit)
 
+        for lit in clauses[first]:
+            var = abs(lit)
+            if var not in a:
+                break
+        if budget is not None:
+            budget.decision()
+
+        saved = first
         for val in (True, False):
-            nc = simplify(c, var, val)
-            if nc is not None:
-                r = backtrack(nc, {**a, var: val})
+            ok, removed = simplify(var, val)
+            if ok:
+                a[var] = val
+                while first < m and not active[first]:
+                    first += 1
+                r = backtrack()
                 if r:
                     return r
+                first = saved
+                del a[var]
+            elif budget is not None:
+                budget.conflict()
+            unsimplify(var, removed)
         return None
 
-    return backtrack(clauses, {})
+    return backtrack()
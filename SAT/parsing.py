@@ -1,4 +1,5 @@
 import sys
+import gzip
 from typing import List, Dict, Tuple
 
 sys.setrecursionlimit(10000)
@@ -7,7 +8,8 @@ def parse_dimacs_cnf(filepath: str) -> Tuple[List[List[int]], int]:
     clauses = []
     num_vars = 0
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
+        opener = gzip.open if filepath.endswith('.gz') else open
+        with opener(filepath, 'rt', encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
                 if not line or line.startswith('c') or line.startswith('%') or line.startswith('0'):
@@ -0,0 +1,183 @@
+import os
+import time
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from budget import Budget, BudgetExceeded, SAT, UNSAT, UNKNOWN
+from backjumping import CBJUPSolver
+from clause_ring import ClauseRing
+
+class Restart(Exception):
+    pass
+
+def luby(i):
+    """i-th term (from 1) of the Luby sequence 1 1 2 1 1 2 4 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if (1 << k) - 1 == i:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+class LearningSolver(CBJUPSolver):
+    """
+    CBJ-UP with nogood learning and Luby restarts. Every conflict set is a
+    nogood: the negation of the decisions in its mask, one literal per
+    decision level, so its LBD is its length. Nogoods with at most
+    `max_lbd` literals are kept, pushed to `export` (a ClauseRing) and
+    added to the clause database at the next restart, together with the
+    clauses read from `imports`. A restart unwinds to an empty trail, so
+    new clauses can watch any two of their literals.
+
+    seed 0 keeps CBJ-UP's variable order and polarity; other seeds perturb
+    the order and pick random polarities, so portfolio workers diverge.
+    """
+    def __init__(self, clauses, num_vars, budget=None, seed=0, max_lbd=3,
+                 restart_base=1000, export=None, imports=()):
+        super().__init__(clauses, num_vars, None, budget)
+        self.max_lbd = max_lbd
+        self.restart_base = restart_base
+        self.export = export
+        self.imports = [[ring, 0] for ring in imports]
+        self.known = {frozenset(c) for c in self.clauses}
+        self.pending = []
+        self.restarts = 0
+        self.imported = 0
+        self.conflicts = 0
+        self.limit = restart_base
+        self.phase = [True] * (self.num_vars + 1)
+        if seed:
+            rng = random.Random(seed)
+            rank = {v: i * (0.5 + rng.random()) for i, v in enumerate(self.order)}
+            self.order.sort(key=rank.__getitem__)
+            self.phase = [rng.random() < 0.5 for _ in self.phase]
+
+    def branches(self, v):
+        return (v, -v) if self.phase[v] else (-v, v)
+
+    def add(self, clause):
+        key = frozenset(clause)
+        if key in self.known:
+            return False
+        self.known.add(key)
+        self.pending.append(clause)
+        return True
+
+    def nogood(self, mask):
+        if not mask:
+            return
+        if mask.bit_count() <= self.max_lbd:
+            level = 1
+            clause = []
+            while mask >> level:
+                if mask >> level & 1:
+                    clause.append(-self.decisions[level])
+                level += 1
+            if self.add(clause) and self.export is not None:
+                self.export.push(clause)
+        self.conflicts += 1
+        if self.conflicts >= self.limit:
+            raise Restart
+
+    def restart(self):
+        self.undo(0)
+        self.decisions = [0]
+        self.restarts += 1
+        self.conflicts = 0
+        self.limit = self.restart_base * luby(self.restarts + 1)
+        for entry in self.imports:
+            clauses, entry[1] = entry[0].read(entry[1])
+            self.imported += sum(self.add(c) for c in clauses)
+        for c in self.pending:
+            if len(c) == 1:
+                self.units.append(c[0])
+            elif c:
+                ci = len(self.clauses)
+                self.clauses.append(list(c))
+                self.watches[c[0]].append(ci)
+                self.watches[c[1]].append(ci)
+        self.pending = []
+
+    def solve(self):
+        if self.empty:
+            return None
+        while True:
+            for lit in self.units:
+                if self.val[lit] == -1:
+                    return None
+                if not self.val[lit]:
+                    self.enqueue(lit, 0)
+            try:
+                if self.search() is not True:
+                    return None
+                return {v: self.val[v] == 1 for v in range(1, self.num_vars + 1)}
+            except Restart:
+                self.restart()
+
+def solve_learning(clauses, num_vars, budget=None, seed=0):
+    return LearningSolver(clauses, num_vars, budget, seed).solve()
+
+# Per-worker state, set once by _init_worker
+_stop = None
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+class StopBudget(Budget):
+    """Worker budget that also gives up once another worker has an answer."""
+    def poll(self):
+        super().poll()
+        if _stop.is_set():
+            self._exceeded("stop")
+
+def run_worker(clauses, num_vars, index, rings, time_limit, max_lbd):
+    """Portfolio worker `index`: writes to rings[index], imports the others."""
+    attached = [ClauseRing(name) for name in rings]
+    try:
+        solver = LearningSolver(clauses, num_vars, StopBudget(time_limit=time_limit), seed=index,
+                                max_lbd=max_lbd, export=attached[index],
+                                imports=[r for i, r in enumerate(attached) if i != index])
+        try:
+            model = solver.solve()
+        except BudgetExceeded:
+            return UNKNOWN, None
+        return (SAT, model) if model else (UNSAT, None)
+    finally:
+        for r in attached:
+            r.close()
+
+def solve_portfolio(clauses, num_vars, budget=None, workers=None, max_lbd=3, slots=4096):
+    """
+    Runs `workers` differently seeded LearningSolvers on the same formula
+    in a process pool. Each worker exports its short nogoods through its
+    own ClauseRing in shared memory and imports the other workers' rings
+    at restarts. The first answer wins and stops the rest. The budget's
+    time limit applies to every worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    time_limit = None
+    if budget is not None and budget.deadline != float("inf"):
+        time_limit = max(0.0, budget.deadline - time.monotonic())
+    rings = [ClauseRing(slots=slots, max_len=max_lbd) for _ in range(workers)]
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    pool = ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker, initargs=(stop,))
+    try:
+        running = {pool.submit(run_worker, clauses, num_vars, i, [r.name for r in rings],
+                               time_limit, max_lbd) for i in range(workers)}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                status, model = fut.result()
+                if status != UNKNOWN:
+                    return model
+        if budget is not None:
+            budget.reason = "time"
+        raise BudgetExceeded("time")
+    finally:
+        stop.set()
+        pool.shutdown(cancel_futures=True)
+        for r in rings:
+            r.close()
+            r.unlink()
@@ -336,7 +336,72 @@ def worker(solver_name, clauses, num_vars, return_dict):
     except Exception as e:
         return_dict['error'] = str(e)
 
-def run_benchmark():
+# Job solver names on the coordinator (see Service/jobs.py)
+CLUSTER_SOLVERS = {
+    "Naive": "naive",
+    "Degree Heuristic": "degree",
+    "DPLL": "dpll",
+    "Backjumping": "cbj",
+}
+
+def run_local(clauses, n_vars, solvers, timeout):
+    """Runs each solver in its own process; yields (name, status, time or None, model)."""
+    for name in solvers:
+        manager = multiprocessing.Manager()
+        ret = manager.dict()
+
+        # Spawn process
+        p = multiprocessing.Process(target=worker, args=(name, clauses, n_vars, ret))
+        p.start()
+        p.join(timeout)
+
+        if p.is_alive():
+            p.terminate()
+            p.join()
+            yield name, "TIMEOUT", None, None
+        elif 'error' in ret:
+            yield name, f"ERROR ({ret['error']})", None, None
+        else:
+            res = ret['result']
+            yield name, "SAT" if res else "UNSAT", ret['time'], res
+
+def submit_cluster(client, files, solvers, timeout):
+    """
+    Submits every (file, solver) job to a coordinator up front, so the
+    workers stay busy; returns {file: [(name, job id)]}. Solving stops
+    cooperatively at the time limit inside the worker.
+    """
+    ids = {}
+    for filepath in files:
+        clauses, n_vars = parse_dimacs_cnf(filepath)
+        payload = {"clauses": clauses, "num_vars": n_vars}
+        ids[filepath] = [(name, client.submit("cnf", payload, solver=CLUSTER_SOLVERS[name],
+                                              budget={"time_limit": timeout}))
+                         for name in solvers]
+    return ids
+
+def run_cluster(client, job_ids):
+    """Yields (name, status, time or None, model) for one file's jobs; other replies are buffered."""
+    for name, jid in job_ids:
+        reply = client.result(jid)
+        status = reply["status"]
+        if status == "UNKNOWN":
+            yield name, "TIMEOUT", None, None
+        elif status == "ERROR":
+            yield name, f"ERROR ({reply.get('error')})", None, None
+        elif status in ("SAT", "UNSAT"):
+            model = {abs(l): l > 0 for l in reply["model"]} if reply.get("model") else None
+            yield name, status, reply.get("time"), model
+        else:
+            # e.g. CANCELLED: no result to report
+            yield name, status, None, None
+
+def run_benchmark(backend="local", address="127.0.0.1:8765"):
+    """
+    backend="local" runs each solver in a local process; backend="cluster"
+    sends every job to a coordinator (Service/coordinator.py) at `address`
+    and its workers, which run the solvers from the SAT package.
+    """
     TIMEOUT = 30 # Seconds per solver
     input_dir = "SAT_Dataset"
     
@@ -349,33 +414,31 @@ def run_benchmark():
     print("-" * 60)
     
     solvers = ["Naive", "Degree Heuristic", "DPLL", "Backjumping"]
-    
-    for filepath in files:
-        filename = os.path.basename(filepath)
-        print(f"\nFile: {filename}")
-        clauses, n_vars = parse_dimacs_cnf(filepath)
-        print(f"Vars: {n_vars}, Clauses: {len(clauses)}")
 
-        for name in solvers:
-            manager = multiprocessing.Manager()
-            ret = manager.dict()
-            
-            # Spawn process
-            p = multiprocessing.Process(target=worker, args=(name, clauses, n_vars, ret))
-            p.start()
-            p.join(TIMEOUT)
-            
-            if p.is_alive():
-                p.terminate()
-                p.join()
-                print(f"  {name:<12}: TIMEOUT")
-            elif 'error' in ret:
-                print(f"  {name:<12}: ERROR ({ret['error']})")
+    client = None
+    if backend == "cluster":
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Service"))
+        from client import SolverClient
+        host, port = address.rsplit(":", 1)
+        client = SolverClient(host, int(port), compress=True)
+        job_ids = submit_cluster(client, files, solvers, TIMEOUT)
+
+    try:
+        for filepath in files:
+            filename = os.path.basename(filepath)
+            print(f"\nFile: {filename}")
+            clauses, n_vars = parse_dimacs_cnf(filepath)
+            print(f"Vars: {n_vars}, Clauses: {len(clauses)}")
+
+            if client is None:
+                results = run_local(clauses, n_vars, solvers, TIMEOUT)
             else:
-                t = ret['time']
-                res = ret['result']
-                status = "SAT" if res else "UNSAT"
-                
+                results = run_cluster(client, job_ids[filepath])
+            for name, status, t, res in results:
+                if t is None:
+                    print(f"  {name:<12}: {status}")
+                    continue
+
                 # Verify validity if SAT
                 check = ""
                 if res:
@@ -384,8 +447,14 @@ def run_benchmark():
                     else:
                         check = "[INVALID]"
                         status = "ERROR"
-                
+
                 print(f"  {name:<12}: {status:<5} in {t:.4f}s {check}")
+    finally:
+        if client is not None:
+            client.close()
 
 if __name__ == "__main__":
-    run_benchmark()
+    if "--cluster" in sys.argv:
+        run_benchmark("cluster", sys.argv[sys.argv.index("--cluster") + 1])
+    else:
+        run_benchmark()
@@ -0,0 +1,186 @@
+from dpll import solve_dpll
+
+def _graph(clauses, num_vars):
+    # Vertices 0..2n-1 are literals (2(v-1) for v, 2(v-1)+1 for -v),
+    # followed by one vertex per clause. Each literal is joined to its
+    # complement and to the clauses containing it.
+    def node(l):
+        return 2 * (abs(l) - 1) + (l < 0)
+
+    n_lits = 2 * num_vars
+    adj = [[] for _ in range(n_lits + len(clauses))]
+    for v in range(num_vars):
+        adj[2*v].append(2*v + 1)
+        adj[2*v + 1].append(2*v)
+    for i, c in enumerate(clauses):
+        ci = n_lits + i
+        for l in c:
+            adj[ci].append(node(l))
+            adj[node(l)].append(ci)
+    colours = [0] * n_lits + [1] * len(clauses)
+    return adj, colours
+
+def _refine(adj, colours):
+    """Colour refinement to an equitable partition with canonical colour numbers."""
+    cells = len(set(colours))
+    while True:
+        sig = [(colours[v], tuple(sorted(colours[u] for u in adj[v]))) for v in range(len(adj))]
+        rank = {s: i for i, s in enumerate(sorted(set(sig)))}
+        colours = [rank[s] for s in sig]
+        if len(rank) == cells:
+            return colours
+        cells = len(rank)
+
+def _individualize(adj, colours, v):
+    new = [2 * c for c in colours]
+    new[v] -= 1
+    return _refine(adj, new)
+
+def _target_cell(colours, n_lits):
+    """Smallest-coloured non-singleton cell, preferring literal vertices."""
+    cells = {}
+    for v, c in enumerate(colours):
+        cells.setdefault(c, []).append(v)
+    multi = [c for c, vs in cells.items() if len(vs) > 1]
+    if not multi:
+        return None
+    lit_cells = [c for c in multi if cells[c][0] < n_lits]
+    return cells[min(lit_cells or multi)]
+
+def _profile(colours):
+    counts = [0] * len(colours)
+    for c in colours:
+        counts[c] += 1
+    return counts
+
+def find_symmetries(clauses, num_vars, max_generators=64, max_leaves=256, budget=None):
+    """
+    Searches for permutation symmetries of the CNF as automorphisms of
+    its clause-literal graph: first-path individualize-and-refine, then
+    one branch per untried vertex on the path, pruned by the orbits of
+    the generators found so far. Incomplete but sound: every candidate
+    is checked against the clause set. Returns a list of literal maps
+    {var: image literal} over the moved variables. `budget` is ticked
+    before every refinement.
+    """
+    # A repeated literal would be a double edge, which refinement cannot
+    # tell apart from a single one
+    clauses = [list(dict.fromkeys(c)) for c in clauses]
+    adj, colours = _graph(clauses, num_vars)
+    n_lits = 2 * num_vars
+    clause_set = {frozenset(c) for c in clauses}
+
+    def individualize(part, v):
+        if budget is not None:
+            budget.tick()
+        return _individualize(adj, part, v)
+
+    path = []
+    part = _refine(adj, colours)
+    while True:
+        cell = _target_cell(part, n_lits)
+        if cell is None:
+            break
+        path.append((part, cell))
+        part = individualize(part, cell[0])
+    leaf = part
+
+    orbit = list(range(len(adj)))
+    def find(x):
+        while orbit[x] != x:
+            orbit[x] = orbit[orbit[x]]
+            x = orbit[x]
+        return x
+
+    def as_literal_map(perm):
+        lit = lambda node: (node // 2 + 1) * (-1 if node & 1 else 1)
+        m = {}
+        for v in range(num_vars):
+            img = lit(perm[2*v])
+            if img != v + 1:
+                m[v + 1] = img
+        return m
+
+    def is_symmetry(m):
+        if not m:
+            return False
+        img = lambda l: (m.get(l, l) if l > 0 else -m.get(-l, -l))
+        return all(frozenset(img(l) for l in c) in clause_set for c in clauses)
+
+    leaves = [max_leaves]
+    def descend(part, level):
+        """Follows the first path's cell shapes below `level`; yields discrete leaves."""
+        if leaves[0] <= 0:
+            return
+        if level == len(path):
+            leaves[0] -= 1
+            if len(set(part)) == len(part):
+                yield part
+            return
+        if _profile(part) != _profile(path[level][0]):
+            return
+        cell = _target_cell(part, n_lits)
+        if cell is None:
+            return
+        for u in cell:
+            yield from descend(individualize(part, u), level + 1)
+
+    generators = []
+    for level in range(len(path) - 1, -1, -1):
+        part, cell = path[level]
+        v = cell[0]
+        for w in cell[1:]:
+            if len(generators) >= max_generators:
+                return generators
+            if find(w) == find(v) or w >= n_lits:
+                continue
+            leaves[0] = max_leaves
+            for other in descend(individualize(part, w), level + 1):
+                by_colour = {c: x for x, c in enumerate(other)}
+                perm = [by_colour[c] for c in leaf]
+                m = as_literal_map(perm)
+                if is_symmetry(m):
+                    generators.append(m)
+                    for x, y in enumerate(perm):
+                        orbit[find(x)] = find(y)
+                    break
+    return generators
+
+def symmetry_breaking_clauses(generators, num_vars, max_support=None):
+    """
+    Lex-leader predicates x <=lex g(x) for each generator g, over its
+    moved variables in increasing order. p_j is a fresh variable meaning
+    the first j moved variables equal their images. Returns
+    (clauses, total number of variables).
+    """
+    clauses = []
+    next_var = num_vars + 1
+    for g in generators:
+        prev = None
+        for j, x in enumerate(sorted(g)[:max_support]):
+            y = g[x]
+            pre = [] if prev is None else [-prev]
+            if y == -x:
+                clauses.append(pre + [-x])
+                break
+            clauses.append(pre + [-x, y])
+            if j == len(g) - 1 or j + 1 == max_support:
+                break
+            p = next_var
+            next_var += 1
+            clauses.append(pre + [-x, p])
+            clauses.append(pre + [y, p])
+            prev = p
+    return clauses, next_var - 1
+
+def break_symmetries(clauses, num_vars, **kw):
+    """Returns (clauses plus symmetry-breaking predicates, total variables)."""
+    sbp, n = symmetry_breaking_clauses(find_symmetries(clauses, num_vars, **kw), num_vars)
+    return clauses + sbp, n
+
+def solve_with_symmetry_breaking(clauses, num_vars, solver=solve_dpll, budget=None):
+    sb_clauses, n = break_symmetries(clauses, num_vars, budget=budget)
+    model = solver(sb_clauses, n, budget=budget)
+    if model is None:
+        return None
+    return {v: val for v, val in model.items() if v <= num_vars}
@@ -0,0 +1,90 @@
+from array import array
+from typing import Dict, List, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Assignment = Union[Dict[int, bool], Sequence[int], bytes]
+
+# bitmap value (0 false, 1 true, 2 unassigned) -> truth of the negative literal
+_NEGATE = bytes([1, 0, 0]) + bytes(253)
+
+class FlatCNF:
+    """
+    A CNF flattened for bulk checking. Clauses are grouped by length,
+    and each group keeps one array of literal codes (2*var + negated)
+    per literal position. A check looks up the truth byte of every
+    literal at once and ORs the positions of a group together as big
+    integers, so no Python code runs per clause.
+    """
+    def __init__(self, clauses: List[List[int]], num_vars: int = 0):
+        self.num_clauses = len(clauses)
+        self.num_vars = max([num_vars] + [abs(l) for c in clauses for l in c])
+        groups = {}
+        for i, c in enumerate(clauses):
+            groups.setdefault(len(c), []).append(i)
+        # length -> (clause indices, [codes of position 0, position 1, ...])
+        self.groups = {}
+        for k, idx in groups.items():
+            cols = [array('l', (2 * abs(clauses[i][j]) + (clauses[i][j] < 0) for i in idx))
+                    for j in range(k)]
+            self.groups[k] = (array('l', idx), cols)
+
+    def bitmap(self, assignment: Assignment) -> bytes:
+        """One byte per variable (index 0 unused): 1 true, 0 false, 2 unassigned."""
+        if isinstance(assignment, (bytes, bytearray)):
+            return bytes(assignment)
+        if isinstance(assignment, dict):
+            b = bytearray([2]) * (self.num_vars + 1)
+            for v, val in assignment.items():
+                if 0 < v <= self.num_vars and val is not None:
+                    b[v] = 1 if val else 0
+            return bytes(b)
+        return bytes(2 if x is None else int(bool(x)) for x in assignment)
+
+    def truth(self, assignment: Assignment) -> bytearray:
+        b = self.bitmap(assignment)[:self.num_vars + 1]
+        b = b + bytes([2]) * (self.num_vars + 1 - len(b))
+        tv = bytearray(2 * len(b))
+        tv[0::2] = b.replace(b'\x02', b'\x00')
+        tv[1::2] = b.translate(_NEGATE)
+        return tv
+
+    def violated(self, assignment: Assignment) -> List[int]:
+        """Indices of the clauses the assignment does not satisfy, in order."""
+        if assignment is None:
+            return list(range(self.num_clauses))
+        get = self.truth(assignment).__getitem__
+        out = []
+        for k, (idx, cols) in self.groups.items():
+            if k == 0:
+                out.extend(idx)
+                continue
+            sat = 0
+            for col in cols:
+                sat |= int.from_bytes(bytes(map(get, col)), 'little')
+            sat = sat.to_bytes(len(idx), 'little')
+            i = sat.find(0)
+            while i != -1:
+                out.append(idx[i])
+                i = sat.find(0, i + 1)
+        out.sort()
+        return out
+
+    def satisfies(self, assignment: Assignment) -> bool:
+        return assignment is not None and not self.violated(assignment)
+
+    def violated_batch(self, assignments: Sequence[Assignment]) -> List[List[int]]:
+        """Violated clause indices for many assignments; one NumPy pass when available."""
+        if np is None or not assignments:
+            return [self.violated(a) for a in assignments]
+        tv = np.array([np.frombuffer(bytes(self.truth(a)), dtype=np.uint8) for a in assignments])
+        bad = np.zeros((len(assignments), self.num_clauses), dtype=bool)
+        for k, (idx, cols) in self.groups.items():
+            sat = np.zeros((len(assignments), len(idx)), dtype=bool)
+            for col in cols:
+                sat |= tv[:, np.frombuffer(col, dtype=col.typecode)].astype(bool)
+            bad[:, np.frombuffer(idx, dtype=idx.typecode)] = ~sat
+        return [np.flatnonzero(row).tolist() for row in bad]
@@ -0,0 +1,100 @@
+import json
+import socket
+import itertools
+from wire import pack
+
+class SolverClient:
+    """
+    Blocking client for server.py and coordinator.py. Jobs can be
+    submitted without waiting; replies arrive in completion order and are
+    matched to jobs by id. With compress=True, payloads are sent packed.
+    """
+    def __init__(self, host="127.0.0.1", port=8765, unix=None, timeout=None, compress=False):
+        if unix:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(unix)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.sock.settimeout(timeout)
+        self.compress = compress
+        self.file = self.sock.makefile("rwb")
+        self.ids = itertools.count(1)
+        self.pending = {}
+
+    def _send(self, obj):
+        self.file.write((json.dumps(obj) + "\n").encode())
+        self.file.flush()
+
+    def _recv(self):
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    def _job(self, kind, payload, solver=None, priority=0, budget=None, id=None):
+        job = {"id": id if id is not None else str(next(self.ids)), "kind": kind, "priority": priority}
+        if self.compress:
+            job["data"] = pack(payload)
+        else:
+            job["payload"] = payload
+        if solver is not None:
+            job["solver"] = solver
+        if budget:
+            job["budget"] = budget
+        return job
+
+    def submit(self, kind, payload, **kw):
+        """Queues one job and returns its id."""
+        job = self._job(kind, payload, **kw)
+        self._send(dict(job, op="solve"))
+        return job["id"]
+
+    def submit_many(self, kind, payloads, **kw):
+        """Queues many jobs in one message and returns their ids."""
+        jobs = [self._job(kind, p, **kw) for p in payloads]
+        self._send({"op": "batch", "jobs": jobs})
+        return [j["id"] for j in jobs]
+
+    def cancel(self, id):
+        self._send({"op": "cancel", "id": id})
+
+    def stats(self):
+        self._send({"op": "stats"})
+        while True:
+            msg = self._recv()
+            if "id" not in msg:
+                return msg
+            self.pending[msg["id"]] = msg
+
+    def result(self, id):
+        """Blocks until the reply for job `id` arrives; other replies are kept for later."""
+        while id not in self.pending:
+            msg = self._recv()
+            self.pending[msg.get("id")] = msg
+        return self.pending.pop(id)
+
+    def results(self, ids):
+        """Yields (id, reply) as replies for `ids` arrive, in completion order."""
+        ids = set(ids)
+        while ids:
+            done = ids & self.pending.keys()
+            if not done:
+                msg = self._recv()
+                self.pending[msg.get("id")] = msg
+                continue
+            for i in done:
+                ids.discard(i)
+                yield i, self.pending.pop(i)
+
+    def solve(self, kind, payload, **kw):
+        return self.result(self.submit(kind, payload, **kw))
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,200 @@
+import time
+import asyncio
+import argparse
+import itertools
+from jobs import DOMAINS
+from server import SolverServer, MAX_LINE
+from wire import pack
+
+# Clients speak the server.py protocol to the coordinator. Workers
+# (worker.py) connect to the same port and identify themselves first:
+#
+#   worker -> {"op": "hello", "name": "box1:4242", "slots": {"cnf": 4}}
+#   coord  -> {"op": "welcome", "ttl": 30}
+#   coord  -> {"op": "lease", "jobs": [{"id": 17, "kind": "cnf", "data": ...}]}
+#   worker -> {"op": "heartbeat"}                       every ttl / 3
+#   worker -> {"op": "result", "id": 17, "status": ..., ...}
+#
+# Leased jobs carry coordinator tokens as ids and packed payloads. Each
+# result is forwarded to its client as soon as it arrives. A worker that
+# disconnects or misses heartbeats for `ttl` seconds loses its leases;
+# those jobs are queued again, up to `max_attempts` leases per job.
+
+class Node:
+    __slots__ = ("name", "writer", "free", "last_seen")
+
+    def __init__(self, name, writer, slots):
+        self.name = name
+        self.writer = writer
+        self.free = dict(slots)
+        self.last_seen = time.monotonic()
+
+class Coordinator(SolverServer):
+    """
+    SolverServer whose jobs run on remote worker processes instead of local
+    pools. The per-domain priority queues, client protocol and cancel
+    semantics are the server's; the dispatcher leases batches of queued
+    jobs to the worker with the most free slots for that domain.
+    """
+    def __init__(self, batch_size=16, domains=tuple(DOMAINS), ttl=30.0, max_attempts=3):
+        super().__init__(workers=1, batch_size=batch_size, domains=domains)
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.nodes = {}
+        self.leases = {}
+        self.attempts = {}
+        self.tokens = itertools.count(1)
+        self.requeued = 0
+        self.capacity = None
+
+    async def start(self):
+        for d in self.domains:
+            self.queues[d] = asyncio.PriorityQueue()
+        self.capacity = asyncio.Condition()
+        self.tasks = [asyncio.create_task(self.dispatch(d)) for d in self.domains]
+        self.tasks.append(asyncio.create_task(self.reap()))
+
+    def pick(self, domain):
+        best = max(self.nodes.values(), key=lambda n: n.free.get(domain, 0), default=None)
+        return best if best is not None and best.free.get(domain, 0) > 0 else None
+
+    async def dispatch(self, domain):
+        queue = self.queues[domain]
+        while True:
+            _, _, job = await queue.get()
+            if job.state != "queued":
+                continue
+            async with self.capacity:
+                node = await self.capacity.wait_for(lambda: self.pick(domain))
+            if job.state != "queued":
+                continue
+            batch = [job]
+            while len(batch) < min(self.batch_size, node.free[domain]) and not queue.empty():
+                _, _, job = queue.get_nowait()
+                if job.state == "queued":
+                    batch.append(job)
+            leased = []
+            for job in batch:
+                job.state = "running"
+                token = next(self.tokens)
+                self.leases[token] = (job, node)
+                self.attempts[job.key] = self.attempts.get(job.key, 0) + 1
+                r = job.request
+                leased.append({"id": token, "kind": domain, "data": r["data"],
+                               "solver": r.get("solver"), "budget": r.get("budget")})
+            node.free[domain] -= len(batch)
+            await self.send(node.writer, {"op": "lease", "jobs": leased})
+
+    async def submit(self, conn, msg, writer):
+        if "payload" in msg:
+            msg = dict(msg)
+            msg["data"] = pack(msg.pop("payload"))
+        return await super().submit(conn, msg, writer)
+
+    async def release(self, node, domain):
+        node.free[domain] += 1
+        async with self.capacity:
+            self.capacity.notify_all()
+
+    async def on_message(self, conn, msg, writer):
+        op = msg.get("op", "solve")
+        node = self.nodes.get(conn)
+        if op == "hello":
+            slots = {d: s for d, s in msg.get("slots", {}).items() if d in self.queues}
+            self.nodes[conn] = Node(msg.get("name", "?"), writer, slots)
+            await self.send(writer, {"op": "welcome", "ttl": self.ttl})
+            async with self.capacity:
+                self.capacity.notify_all()
+        elif node is not None:
+            node.last_seen = time.monotonic()
+            if op == "result":
+                await self.result(node, msg)
+        else:
+            await super().on_message(conn, msg, writer)
+
+    async def result(self, node, reply):
+        token = reply.pop("id", None)
+        job, owner = self.leases.get(token, (None, None))
+        # Results for leases this worker already lost are dropped
+        if owner is not node:
+            return
+        del self.leases[token]
+        await self.release(node, job.domain)
+        self.jobs.pop(job.key, None)
+        self.attempts.pop(job.key, None)
+        if job.state == "cancelled":
+            return
+        job.state = "done"
+        self.completed += 1
+        reply.pop("op", None)
+        reply["id"] = job.request["id"]
+        reply["worker"] = node.name
+        await self.send(job.writer, reply)
+
+    def disconnected(self, conn):
+        node = self.nodes.pop(conn, None)
+        if node is None:
+            super().disconnected(conn)
+            return
+        for token, (job, owner) in list(self.leases.items()):
+            if owner is not node:
+                continue
+            del self.leases[token]
+            if job.state == "cancelled":
+                self.jobs.pop(job.key, None)
+            elif self.attempts.get(job.key, 0) >= self.max_attempts:
+                self.jobs.pop(job.key, None)
+                self.attempts.pop(job.key, None)
+                job.state = "done"
+                asyncio.create_task(self.send(job.writer, {
+                    "id": job.request["id"], "status": "ERROR",
+                    "error": f"worker lost {self.max_attempts} times"}))
+            else:
+                job.state = "queued"
+                self.requeued += 1
+                self.queues[job.domain].put_nowait((job.request.get("priority", 0), next(self.seq), job))
+
+    async def reap(self):
+        # Workers that stop sending heartbeats lose their leases
+        while True:
+            await asyncio.sleep(self.ttl / 4)
+            now = time.monotonic()
+            for conn, node in list(self.nodes.items()):
+                if now - node.last_seen > self.ttl:
+                    self.disconnected(conn)
+                    node.writer.close()
+
+    def stats(self):
+        s = super().stats()
+        s["workers"] = {n.name: n.free for n in self.nodes.values()}
+        s["requeued"] = self.requeued
+        return s
+
+async def serve(host="127.0.0.1", port=8765, **kw):
+    coord = Coordinator(**kw)
+    await coord.start()
+    listener = await asyncio.start_server(coord.handle, host, port, limit=MAX_LINE)
+    print(f"Coordinating {', '.join(coord.domains)} on {host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        coord.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Coordinator that leases solver jobs to worker.py processes.")
+    ap.add_argument("--host", default="127.0.0.1", help="use 0.0.0.0 to accept remote workers")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--batch-size", type=int, default=16, help="most jobs leased to a worker at once")
+    ap.add_argument("--ttl", type=float, default=30.0, help="seconds without a heartbeat before a worker's leases expire")
+    ap.add_argument("--max-attempts", type=int, default=3, help="leases per job before it fails")
+    ap.add_argument("--domains", nargs="+", choices=list(DOMAINS), default=list(DOMAINS))
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, batch_size=args.batch_size, domains=args.domains,
+                          ttl=args.ttl, max_attempts=args.max_attempts))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import importlib
+from wire import job_payload
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each domain lives in its own directory and SAT/ and Sudoku/ share module
+# names (parsing, budget, main), so one process only ever serves one
+# domain: its directory is put first on sys.path by init_worker.
+DOMAINS = {
+    "cnf": "SAT",
+    "sudoku": "Sudoku",
+    "minesweeper": "Bonus",
+}
+
+# name -> (module, function); the first entry is the default
+SOLVERS = {
+    "cnf": {
+        "dpll": ("dpll", "solve_dpll"),
+        "jit": ("codegen", "solve_dpll_compiled"),
+        "cbj": ("backjumping", "solve_backjumping"),
+        "cbj_up": ("backjumping", "solve_backjumping_up"),
+        "lookahead": ("lookahead", "solve_lookahead"),
+        "naive": ("naive", "solve_naive"),
+        "degree": ("degree_heuristic", "solve_degree_heuristic"),
+        "walksat": ("local_search", "solve_walksat"),
+        "symmetry": ("symmetry", "solve_with_symmetry_breaking"),
+    },
+    "sudoku": {
+        "mrv": ("solver_mrv", "solve_mrv"),
+        "cbj_fc": ("solver_cbj", "solve_backjumping_fc"),
+        "cbj": ("solver_cbj", "solve_backjumping"),
+        "unit_prop": ("solver_unit_prop", "solve_unit_prop"),
+        "backtracking": ("solver_backtracking", "solve_backtracking"),
+    },
+    "minesweeper": {
+        "infer": ("minesweeper", "infer_moves"),
+    },
+}
+INCOMPLETE = {"walksat"}
+
+def init_worker(domain):
+    """Pool initializer: puts the domain directory on sys.path and imports its solvers."""
+    sys.path.insert(0, os.path.join(ROOT, DOMAINS[domain]))
+    for module, _ in SOLVERS[domain].values():
+        importlib.import_module(module)
+    if domain != "minesweeper":
+        importlib.import_module("budget")
+
+def _solver(domain, name):
+    if name is None:
+        name = next(iter(SOLVERS[domain]))
+    module, func = SOLVERS[domain][name]
+    return name, getattr(importlib.import_module(module), func)
+
+def _budget(limits):
+    from budget import Budget
+    return Budget(**limits) if limits else None
+
+def run_job(domain, job):
+    """Solves one job dict and returns its reply (without the id)."""
+    name, solver = _solver(domain, job.get("solver"))
+    payload = job_payload(job)
+
+    if domain == "cnf":
+        from budget import solve_with_budget
+        budget = _budget(job.get("budget"))
+        status, model = solve_with_budget(solver, payload["clauses"], payload["num_vars"],
+                                          budget, complete=name not in INCOMPLETE)
+        model = sorted(v if val else -v for v, val in model.items()) if model else None
+        return {"status": status, "model": model}
+
+    if domain == "sudoku":
+        from budget import solve_with_budget
+        board = [row[:] for row in payload["board"]]
+        status = solve_with_budget(solver, board, _budget(job.get("budget")))
+        return {"status": status, "board": board if status == "SAT" else None}
+
+    moves = solver(payload["board"])
+    return {"status": "OK", "moves": [[r, c, s] for (r, c), s in moves.items()]}
+
+def run_batch(domain, jobs):
+    """
+    Runs a list of jobs in this worker and returns one reply per job, in
+    order. A failing job yields an error reply and does not affect the
+    rest of the batch.
+    """
+    replies = []
+    for job in jobs:
+        start = time.time()
+        try:
+            reply = run_job(domain, job)
+        except Exception as e:
+            reply = {"status": "ERROR", "error": f"{type(e).__name__}: {e}"}
+        reply["id"] = job["id"]
+        reply["time"] = time.time() - start
+        replies.append(reply)
+    return replies
@@ -0,0 +1,256 @@
+import os
+import json
+import asyncio
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from jobs import DOMAINS, SOLVERS, init_worker, run_batch
+
+# Wire format: one JSON object per line in each direction.
+#
+#   {"op": "solve", "id": "a1", "kind": "cnf", "payload": {...},
+#    "solver": "dpll", "priority": 0, "budget": {"time_limit": 5}}
+#   {"op": "batch", "jobs": [<solve requests>]}
+#   {"op": "cancel", "id": "a1"}
+#   {"op": "stats"}
+#
+# A job may carry "data" (see wire.pack) instead of "payload". Every
+# solve job gets exactly one reply carrying its id: a result
+# ({"status": "SAT", "model": [...]} etc.), "CANCELLED" or "ERROR".
+# Lower priority values run first; ties run in arrival order.
+
+# Longest accepted request line; formulas travel inline
+MAX_LINE = 1 << 28
+
+class Job:
+    __slots__ = ("key", "domain", "request", "writer", "state")
+
+    def __init__(self, key, domain, request, writer):
+        self.key = key
+        self.domain = domain
+        self.request = request
+        self.writer = writer
+        self.state = "queued"
+
+def _valid_id(jid):
+    # Ids key the job table, so they must be hashable; bools are excluded
+    # because True == 1 would collide with the id 1
+    return isinstance(jid, (str, int)) and not isinstance(jid, bool)
+
+class SolverServer:
+    """
+    Keeps one warm process pool per domain (cnf, sudoku, minesweeper) and a
+    priority queue in front of each. A dispatcher per domain hands batches
+    of queued jobs to idle workers, so many small jobs share one pool
+    round-trip; replies are written as each batch finishes.
+    """
+    def __init__(self, workers=None, batch_size=16, domains=tuple(DOMAINS)):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.domains = list(domains)
+        self.pools = {}
+        self.queues = {}
+        self.jobs = {}
+        self.seq = itertools.count()
+        self.completed = 0
+        self.tasks = []
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        ctx = multiprocessing.get_context("spawn")
+        for d in self.domains:
+            self.pools[d] = ProcessPoolExecutor(self.workers, mp_context=ctx,
+                                                initializer=init_worker, initargs=(d,))
+            self.queues[d] = asyncio.PriorityQueue()
+        # Start every worker now so requests never pay interpreter start-up
+        # or solver imports
+        await asyncio.gather(*(loop.run_in_executor(pool, run_batch, d, [])
+                               for d, pool in self.pools.items() for _ in range(self.workers)))
+        self.tasks = [asyncio.create_task(self.dispatch(d)) for d in self.domains]
+
+    def close(self):
+        for t in self.tasks:
+            t.cancel()
+        for pool in self.pools.values():
+            pool.shutdown(cancel_futures=True)
+
+    async def send(self, writer, obj):
+        if writer.is_closing():
+            return
+        writer.write((json.dumps(obj) + "\n").encode())
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def dispatch(self, domain):
+        loop = asyncio.get_running_loop()
+        queue, pool = self.queues[domain], self.pools[domain]
+        idle = asyncio.Semaphore(self.workers)
+        while True:
+            await idle.acquire()
+            batch = []
+            while not batch:
+                _, _, job = await queue.get()
+                if job.state == "queued":
+                    batch.append(job)
+            # Share the backlog across workers instead of giving it all to one
+            take = min(self.batch_size, max(1, queue.qsize() // self.workers))
+            while len(batch) < take and not queue.empty():
+                _, _, job = queue.get_nowait()
+                if job.state == "queued":
+                    batch.append(job)
+            for job in batch:
+                job.state = "running"
+            fut = loop.run_in_executor(pool, run_batch, domain, [j.request for j in batch])
+            asyncio.create_task(self.finish(batch, fut, idle))
+
+    async def finish(self, batch, fut, idle):
+        try:
+            replies = await fut
+        except Exception as e:
+            replies = [{"id": j.request["id"], "status": "ERROR", "error": f"{type(e).__name__}: {e}"}
+                       for j in batch]
+        finally:
+            idle.release()
+        for job, reply in zip(batch, replies):
+            self.jobs.pop(job.key, None)
+            if job.state == "cancelled":
+                continue
+            job.state = "done"
+            self.completed += 1
+            await self.send(job.writer, reply)
+
+    async def submit(self, conn, msg, writer):
+        jid = msg.get("id")
+        kind = msg.get("kind")
+        if jid is None:
+            return {"status": "ERROR", "error": "missing id"}
+        if not _valid_id(jid):
+            return {"status": "ERROR", "error": f"invalid id {jid!r}"}
+        if kind not in self.queues:
+            return {"id": jid, "status": "ERROR", "error": f"unknown kind {kind!r}"}
+        if msg.get("solver") is not None and msg["solver"] not in SOLVERS[kind]:
+            return {"id": jid, "status": "ERROR", "error": f"unknown solver {msg['solver']!r}"}
+        if "payload" not in msg and "data" not in msg:
+            return {"id": jid, "status": "ERROR", "error": "missing payload"}
+        priority = msg.get("priority", 0)
+        # Queue entries are compared by priority, so one bad value would
+        # break the heap for every client
+        if not isinstance(priority, (int, float)) or isinstance(priority, bool) or priority != priority:
+            return {"id": jid, "status": "ERROR", "error": f"invalid priority {priority!r}"}
+        key = (conn, jid)
+        if key in self.jobs:
+            return {"id": jid, "status": "ERROR", "error": "duplicate id"}
+        job = self.jobs[key] = Job(key, kind, msg, writer)
+        self.queues[kind].put_nowait((priority, next(self.seq), job))
+        return None
+
+    def cancel(self, conn, jid):
+        # A running job cannot be interrupted in its worker; its result is
+        # dropped when it arrives. Use a budget to bound its run time.
+        if not _valid_id(jid):
+            return {"status": "ERROR", "error": f"invalid id {jid!r}"}
+        job = self.jobs.get((conn, jid))
+        if job is None:
+            return {"id": jid, "status": "ERROR", "error": "unknown job"}
+        if job.state == "queued":
+            self.jobs.pop(job.key)
+        job.state = "cancelled"
+        return {"id": jid, "status": "CANCELLED"}
+
+    def stats(self):
+        return {"queued": {d: q.qsize() for d, q in self.queues.items()},
+                "running": sum(j.state == "running" for j in self.jobs.values()),
+                "completed": self.completed, "workers": self.workers}
+
+    async def on_message(self, conn, msg, writer):
+        op = msg.get("op", "solve")
+        if op == "solve":
+            reply = await self.submit(conn, msg, writer)
+            if reply:
+                await self.send(writer, reply)
+        elif op == "batch":
+            jobs = msg.get("jobs", [])
+            if not isinstance(jobs, list):
+                await self.send(writer, {"status": "ERROR", "error": "jobs must be a list"})
+                return
+            for job in jobs:
+                if not isinstance(job, dict):
+                    reply = {"status": "ERROR", "error": "job must be a JSON object"}
+                else:
+                    reply = await self.submit(conn, job, writer)
+                if reply:
+                    await self.send(writer, reply)
+        elif op == "cancel":
+            await self.send(writer, self.cancel(conn, msg.get("id")))
+        elif op == "stats":
+            await self.send(writer, self.stats())
+        else:
+            await self.send(writer, {"status": "ERROR", "error": f"unknown op {op!r}"})
+
+    def disconnected(self, conn):
+        # Drop whatever this client still has queued
+        for key, job in list(self.jobs.items()):
+            if key[0] is conn:
+                self.cancel(conn, key[1])
+
+    async def handle(self, reader, writer):
+        conn = object()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self.send(writer, {"status": "ERROR", "error": "request line too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    await self.send(writer, {"status": "ERROR", "error": "invalid JSON"})
+                    continue
+                if not isinstance(msg, dict):
+                    await self.send(writer, {"status": "ERROR", "error": "request must be a JSON object"})
+                    continue
+                await self.on_message(conn, msg, writer)
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnected(conn)
+            writer.close()
+
+async def serve(host="127.0.0.1", port=8765, unix=None, **kw):
+    server = SolverServer(**kw)
+    await server.start()
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle, path=unix, limit=MAX_LINE)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, limit=MAX_LINE)
+    addr = unix or f"{host}:{port}"
+    print(f"Serving {', '.join(server.domains)} on {addr} with {server.workers} workers per domain")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local solver server (JSON lines over TCP or a Unix socket).")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    ap.add_argument("--workers", type=int, help="processes per domain (default: CPU count)")
+    ap.add_argument("--batch-size", type=int, default=16, help="most jobs sent to a worker at once")
+    ap.add_argument("--domains", nargs="+", choices=list(DOMAINS), default=list(DOMAINS))
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, workers=args.workers,
+                          batch_size=args.batch_size, domains=args.domains))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
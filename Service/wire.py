@@ -0,0 +1,19 @@
+import json
+import zlib
+import base64
+
+# Job payloads (formulas, boards) can travel compressed: the "data" field
+# of a job holds base64(zlib(JSON payload)) in place of "payload".
+
+def pack(payload, level=6):
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.b64encode(zlib.compress(raw, level)).decode("ascii")
+
+def unpack(data):
+    return json.loads(zlib.decompress(base64.b64decode(data)))
+
+def job_payload(job):
+    """The payload of a job dict, whether it was sent plain or packed."""
+    if "payload" in job:
+        return job["payload"]
+    return unpack(job["data"])
@@ -0,0 +1,111 @@
+import os
+import json
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from jobs import DOMAINS, init_worker, run_batch
+from server import MAX_LINE
+
+class Worker:
+    """
+    Connects to a coordinator, runs leased jobs on one warm process pool
+    per domain (`slots` processes each) and streams each result back as
+    soon as it finishes. Heartbeats go out every ttl / 3 seconds while
+    connected. If the connection drops, the worker reconnects; jobs that
+    were still running are abandoned, as the coordinator re-queues them.
+    """
+    def __init__(self, host="127.0.0.1", port=8765, slots=None, domains=tuple(DOMAINS), name=None):
+        self.host = host
+        self.port = port
+        self.slots = slots or os.cpu_count() or 1
+        self.domains = list(domains)
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.pools = {}
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        ctx = multiprocessing.get_context("spawn")
+        for d in self.domains:
+            self.pools[d] = ProcessPoolExecutor(self.slots, mp_context=ctx,
+                                                initializer=init_worker, initargs=(d,))
+        await asyncio.gather(*(loop.run_in_executor(pool, run_batch, d, [])
+                               for d, pool in self.pools.items() for _ in range(self.slots)))
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.shutdown(cancel_futures=True)
+
+    async def send(self, writer, obj):
+        if writer.is_closing():
+            return
+        writer.write((json.dumps(obj) + "\n").encode())
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def heartbeat(self, writer, interval):
+        while True:
+            await asyncio.sleep(interval)
+            await self.send(writer, {"op": "heartbeat"})
+
+    async def run(self, job, writer):
+        loop = asyncio.get_running_loop()
+        reply, = await loop.run_in_executor(self.pools[job["kind"]], run_batch, job["kind"], [job])
+        await self.send(writer, dict(reply, op="result"))
+
+    async def session(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE)
+        tasks = set()
+        try:
+            await self.send(writer, {"op": "hello", "name": self.name,
+                                     "slots": {d: self.slots for d in self.domains}})
+            welcome = json.loads(await reader.readline())
+            tasks.add(asyncio.create_task(self.heartbeat(writer, welcome["ttl"] / 3)))
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line)
+                if msg.get("op") == "lease":
+                    for job in msg["jobs"]:
+                        t = asyncio.create_task(self.run(job, writer))
+                        tasks.add(t)
+                        t.add_done_callback(tasks.discard)
+        finally:
+            for t in tasks:
+                t.cancel()
+            writer.close()
+
+    async def serve(self, retry=2.0):
+        await self.start()
+        try:
+            while True:
+                try:
+                    await self.session()
+                    print(f"{self.name}: coordinator closed the connection")
+                except (OSError, ValueError) as e:
+                    print(f"{self.name}: {type(e).__name__}: {e}")
+                await asyncio.sleep(retry)
+        finally:
+            self.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Solver worker for coordinator.py.")
+    ap.add_argument("--host", default="127.0.0.1", help="coordinator address")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--slots", type=int, help="processes per domain (default: CPU count)")
+    ap.add_argument("--domains", nargs="+", choices=list(DOMAINS), default=list(DOMAINS))
+    ap.add_argument("--name", help="name shown in coordinator stats and replies")
+    ap.add_argument("--retry", type=float, default=2.0, help="seconds between reconnect attempts")
+    args = ap.parse_args(argv)
+    worker = Worker(args.host, args.port, args.slots, args.domains, args.name)
+    try:
+        asyncio.run(worker.serve(args.retry))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+from itertools import repeat
+from multiprocessing import Pool
+from parsing import encode_board, decode_board
+from budget import Budget
+
+_solver = None
+_limits = None
+
+def _init(solver, limits=None):
+    global _solver, _limits
+    _solver, _limits = solver, limits
+
+def _solve_one(task):
+    data, expected = task
+    board = decode_board(data)
+    # A failing solver fails its puzzle only, not the whole batch; so
+    # does one that runs out of its budget (BudgetExceeded)
+    try:
+        if _limits:
+            solved = bool(_solver(board, budget=Budget(**_limits)))
+        else:
+            solved = bool(_solver(board))
+    except Exception as e:
+        return False, data, False if expected is not None else None, f"{type(e).__name__}: {e}"
+    out = encode_board(board)
+    return solved, out, (out == expected) if expected is not None else None, None
+
+def _encoded(boards):
+    for b in boards:
+        yield b if isinstance(b, (bytes, bytearray)) else encode_board(b)
+
+def solve_many(puzzles, solver, workers=None, chunksize=64, solutions=None, limits=None):
+    """
+    Solves a batch of puzzles on a process pool and yields
+    (solved, board_bytes, correct, error) in input order. Boards travel
+    as one byte per cell; `correct` is checked in the worker against the
+    matching entry of `solutions`, or is None when none are given.
+    `error` is None, or the message of the exception the solver raised.
+    With `limits` (Budget keyword arguments, e.g. {"time_limit": 10}),
+    each puzzle is solved under its own Budget.
+    """
+    expected = _encoded(solutions) if solutions is not None else repeat(None)
+    tasks = zip(_encoded(puzzles), expected)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        _init(solver, limits)
+        yield from map(_solve_one, tasks)
+        return
+
+    with Pool(workers, initializer=_init, initargs=(solver, limits)) as pool:
+        yield from pool.imap(_solve_one, tasks, chunksize)
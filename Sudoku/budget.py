@@ -0,0 +1,28 @@
+import os
+import sys
+import importlib.util
+
+# Budget, BudgetExceeded and the statuses are SAT/budget.py's. That file
+# is loaded by path, as "sat_budget", because this module has the same
+# name. Only solve_with_budget differs: Sudoku solvers take a board.
+_SAT_BUDGET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SAT", "budget.py")
+if "sat_budget" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location("sat_budget", _SAT_BUDGET)
+    sys.modules["sat_budget"] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules["sat_budget"])
+from sat_budget import Budget, BudgetExceeded, rss_mb, SAT, UNSAT, UNKNOWN
+
+def solve_with_budget(solver, board, budget=None):
+    """
+    Runs solver(board, budget=budget) in-process and returns SAT (board
+    solved in place), UNSAT (no solution) or UNKNOWN (budget ran out,
+    board restored to the puzzle).
+    """
+    puzzle = [row[:] for row in board]
+    try:
+        solved = solver(board, budget=budget)
+    except BudgetExceeded:
+        for row, orig in zip(board, puzzle):
+            row[:] = orig
+        return UNKNOWN
+    return SAT if solved else UNSAT
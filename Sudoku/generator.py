@@ -0,0 +1,110 @@
+import argparse
+import random
+from parsing import write_sudoku_file
+from solver_mrv import solve_mrv, count_solutions
+from budget import Budget, BudgetExceeded
+
+# Upper bounds on MRV search nodes per blank cell for each rating
+RATINGS = [("easy", 1.0), ("medium", 3.0), ("hard", 20.0), ("extreme", None)]
+
+def random_solution(n=3, rng=random):
+    """
+    Fills the diagonal boxes at random, then completes them with MRV.
+    Completion times are heavy-tailed on large boards, so a completion
+    taking more than 8 decisions per cell starts over with a new fill.
+    """
+    N = n * n
+    while True:
+        board = [[0] * N for _ in range(N)]
+        for k in range(n):
+            vals = rng.sample(range(1, N+1), N)
+            for i in range(N):
+                board[k*n + i//n][k*n + i%n] = vals[i]
+        try:
+            solve_mrv(board, budget=Budget(max_decisions=8 * N * N))
+            return board
+        except BudgetExceeded:
+            pass
+
+def is_unique(board, max_decisions=None):
+    """
+    True when the board provably has one solution. A check that runs out
+    of its `max_decisions` counts as not unique, so the given is kept.
+    """
+    try:
+        return count_solutions(board, 2, budget=Budget(max_decisions=max_decisions)) == 1
+    except BudgetExceeded:
+        return False
+
+def rate(puzzle):
+    """Returns (nodes, label) from an MRV solve of a copy of the puzzle."""
+    stats = {}
+    solve_mrv([row[:] for row in puzzle], stats)
+    blanks = sum(v == 0 for row in puzzle for v in row)
+    nodes = stats['nodes']
+    for label, bound in RATINGS:
+        if bound is None or nodes <= bound * (blanks + 1):
+            return nodes, label
+
+def generate_puzzle(n=3, rng=random, min_givens=0, max_decisions=None):
+    """
+    Removes givens from a random solution in random order, keeping
+    each removal only if the solution stays unique within
+    `max_decisions` MRV decisions. Returns (puzzle, solution).
+    """
+    solution = random_solution(n, rng)
+    N = n * n
+    puzzle = [row[:] for row in solution]
+    cells = [(r, c) for r in range(N) for c in range(N)]
+    rng.shuffle(cells)
+    givens = N * N
+
+    for r, c in cells:
+        if givens <= min_givens:
+            break
+        v = puzzle[r][c]
+        puzzle[r][c] = 0
+        if is_unique(puzzle, max_decisions):
+            givens -= 1
+        else:
+            puzzle[r][c] = v
+    return puzzle, solution
+
+def generate(count, n=3, seed=None, min_givens=0, min_nodes=0, max_decisions=None):
+    """Yields (puzzle, solution, nodes, label) for rated puzzles."""
+    rng = random.Random(seed)
+    made = 0
+    while made < count:
+        puzzle, solution = generate_puzzle(n, rng, min_givens, max_decisions)
+        nodes, label = rate(puzzle)
+        if nodes < min_nodes:
+            continue
+        made += 1
+        yield puzzle, solution, nodes, label
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate unique-solution Sudoku puzzles.")
+    ap.add_argument("-k", "--count", type=int, default=10)
+    ap.add_argument("-n", "--box", type=int, default=3, help="box size (3 = 9x9)")
+    ap.add_argument("--seed", type=int)
+    ap.add_argument("--min-givens", type=int, default=0)
+    ap.add_argument("--min-nodes", type=int, default=0,
+                    help="only keep puzzles needing at least this many MRV nodes")
+    ap.add_argument("--max-decisions", type=int, default=10000,
+                    help="MRV decisions per uniqueness check; a given is kept when a check runs out")
+    ap.add_argument("--out", default="Sudoku_Dataset/generated.txt")
+    ap.add_argument("--solutions", default="Sudoku_Dataset/generated_soln.txt")
+    args = ap.parse_args()
+
+    puzzles, solutions, tags = [], [], []
+    for p, s, nodes, label in generate(args.count, args.box, args.seed,
+                                       args.min_givens, args.min_nodes, args.max_decisions):
+        puzzles.append(p); solutions.append(s); tags.append(f"{label} nodes={nodes}")
+        print(f"  {len(puzzles)}: {label} ({nodes} nodes)")
+
+    write_sudoku_file(args.out, puzzles, tags)
+    write_sudoku_file(args.solutions, solutions)
+    print(f"Wrote {len(puzzles)} puzzles to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,50 @@
-import time, copy
-from parsing import parse_sudoku_file, boards_match
+import time
+from parsing import parse_sudoku_file
+from batch import solve_many
 from solver_backtracking import solve_backtracking
 from solver_mrv import solve_mrv
 from solver_unit_prop import solve_unit_prop
-from solver_cbj import solve_backjumping
+from solver_cbj import solve_backjumping, solve_backjumping_fc
 
-def run_benchmark():
-    puzzles = parse_sudoku_file("Sudoku_Dataset/sudoku95test.txt")
-    solutions = parse_sudoku_file("Sudoku_Dataset/soln_raw.txt")
-
-    if len(puzzles) != len(solutions):
-        print("Error: mismatch puzzle counts")
-        return
+DATASETS = [
+    ("9x9", 3, "Sudoku_Dataset/sudoku95test.txt", "Sudoku_Dataset/soln_raw.txt"),
+    ("16x16", 4, "Sudoku_Dataset/sudoku16test.txt", "Sudoku_Dataset/soln16_raw.txt"),
+    ("25x25", 5, "Sudoku_Dataset/sudoku25test.txt", "Sudoku_Dataset/soln25_raw.txt"),
+]
 
+def run_benchmark(datasets=DATASETS, workers=None, time_limit=10):
     solvers = [
         ("Naive Backtracking", solve_backtracking),
         ("Backtracking + MRV", solve_mrv),
         ("Unit Propagation", solve_unit_prop),
-        ("Backjumping (CBJ)", solve_backjumping)
+        ("Backjumping (CBJ)", solve_backjumping),
+        ("CBJ + MRV/FC", solve_backjumping_fc)
     ]
 
-    print(f"Running {len(puzzles)} puzzles...")
+    for label, n, puzzle_file, soln_file in datasets:
+        puzzles = parse_sudoku_file(puzzle_file, n)
+        solutions = parse_sudoku_file(soln_file, n)
+
+        if len(puzzles) != len(solutions):
+            print("Error: mismatch puzzle counts")
+            continue
+
+        print(f"\nRunning {len(puzzles)} {label} puzzles...")
 
-    for name, solver in solvers:
-        total = 0; correct = 0
-        cp = copy.deepcopy(puzzles)
-        print(name)
-        start = time.time()
+        for name, solver in solvers:
+            total = 0; correct = 0; failed = 0
+            print(name)
+            start = time.time()
 
-        for i,p in enumerate(cp):
-            solver(p)
-            if boards_match(p, solutions[i]):
-                correct += 1
+            # Each puzzle gets `time_limit` seconds; the weaker solvers
+            # run out on many of the larger boards
+            for _, _, ok, error in solve_many(puzzles, solver, workers, solutions=solutions,
+                                              limits={"time_limit": time_limit}):
+                correct += ok
+                failed += error is not None
 
-        total = time.time() - start
-        print(f"  Correct: {correct}/{len(cp)} | Time: {total:.3f}s")
+            total = time.time() - start
+            print(f"  Correct: {correct}/{len(puzzles)} | Failed: {failed} | Time: {total:.3f}s")
 
 if __name__ == "__main__":
     run_benchmark()
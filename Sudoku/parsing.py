@@ -1,4 +1,14 @@
-def parse_sudoku_file(filepath):
+import mmap
+from math import isqrt
+
+SYMBOLS = b".123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_FROM_SYMBOL = bytes.maketrans(SYMBOLS + b"0", bytes(range(len(SYMBOLS))) + b"\0")
+_TO_SYMBOL = bytes.maketrans(bytes(range(len(SYMBOLS))), SYMBOLS)
+_UNPACK = [bytes((b >> 4, b & 15)) for b in range(256)]
+
+def parse_sudoku_file(filepath, n=3):
+    side = n * n
+    size = side * side
     boards = []
     try:
         with open(filepath, 'r') as f:
@@ -10,13 +20,89 @@ def parse_sudoku_file(filepath):
                 continue
             if token.isdigit():
                 current.append(int(token))
-                if len(current) == 81:
-                    boards.append([current[i:i+9] for i in range(0, 81, 9)])
+                if len(current) == size:
+                    boards.append([current[i:i+side] for i in range(0, size, side)])
                     current = []
         return boards
     except FileNotFoundError:
         print(f"Error: File not found {filepath}")
         return []
 
+def write_sudoku_file(filepath, boards, tags=None):
+    """Writes boards in the grid format read by parse_sudoku_file."""
+    with open(filepath, 'w') as f:
+        for i, b in enumerate(boards):
+            if tags is not None:
+                f.write(f"[{tags[i]}]\n")
+            for row in b:
+                f.write(" ".join(str(v) if v else "." for v in row) + " \n")
+            f.write("\n")
+
 def boards_match(b1, b2):
-    return all(b1[r][c] == b2[r][c] for r in range(9) for c in range(9))
+    N = len(b1)
+    return N == len(b2) and all(b1[r][c] == b2[r][c] for r in range(N) for c in range(N))
+
+def encode_board(board):
+    return bytes(v for row in board for v in row)
+
+def decode_board(data):
+    side = isqrt(len(data))
+    return [list(data[i:i+side]) for i in range(0, side * side, side)]
+
+def _mapped(filepath):
+    with open(filepath, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def write_line_file(filepath, boards):
+    """One board per line, one symbol per cell ('.' for empty)."""
+    with open(filepath, 'wb') as f:
+        for b in boards:
+            data = b if isinstance(b, (bytes, bytearray)) else encode_board(b)
+            f.write(data.translate(_TO_SYMBOL) + b"\n")
+
+def write_packed_file(filepath, boards, nibble=False):
+    """
+    Fixed-size binary records: one byte per cell, or two cells per byte.
+    Nibbles hold values up to 15, so nibble=True needs a side of at most 15.
+    """
+    records = [b if isinstance(b, (bytes, bytearray)) else encode_board(b) for b in boards]
+    # Checked before opening, so a bad board does not truncate an existing file
+    if nibble:
+        side = max((isqrt(len(data)) for data in records), default=0)
+        if side > 15:
+            raise ValueError(f"nibble packing needs a side of at most 15, got {side}")
+    with open(filepath, 'wb') as f:
+        for data in records:
+            if nibble:
+                if len(data) % 2:
+                    data += b"\0"
+                data = bytes(data[i] << 4 | data[i+1] for i in range(0, len(data), 2))
+            f.write(data)
+
+def iter_line_file(filepath, n=3):
+    """Lazily yields encoded boards from a memory-mapped line file."""
+    size = n**4
+    mm = _mapped(filepath)
+    if mm is None:
+        return
+    with mm:
+        for line in iter(mm.readline, b""):
+            line = line.strip()
+            if len(line) == size:
+                yield line.translate(_FROM_SYMBOL)
+
+def iter_packed_file(filepath, n=3, nibble=False):
+    """Lazily yields encoded boards from a memory-mapped packed file."""
+    size = n**4
+    record = (size + 1) // 2 if nibble else size
+    mm = _mapped(filepath)
+    if mm is None:
+        return
+    with mm:
+        for off in range(0, len(mm) - record + 1, record):
+            data = mm[off:off+record]
+            if nibble:
+                data = b"".join(map(_UNPACK.__getitem__, data))[:size]
+            yield data
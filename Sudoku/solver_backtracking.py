@@ -1,14 +1,19 @@
-def solve_backtracking(board):
+from math import isqrt
+
+def solve_backtracking(board, budget=None):
+    N = len(board)
+    n = isqrt(N)
+
     def is_valid(b, r, c, num):
-        for i in range(9):
+        for i in range(N):
             if b[r][i] == num or b[i][c] == num:
                 return False
-        br, bc = (r // 3) * 3, (c // 3) * 3
-        return all(b[i][j] != num for i in range(br, br+3) for j in range(bc, bc+3))
+        br, bc = (r // n) * n, (c // n) * n
+        return all(b[i][j] != num for i in range(br, br+n) for j in range(bc, bc+n))
 
     def find_empty(b):
-        for r in range(9):
-            for c in range(9):
+        for r in range(N):
+            for c in range(N):
                 if b[r][c] == 0:
                     return r, c
         return None
@@ -17,11 +22,15 @@ def solve_backtracking(board):
     if not pos:
         return True
     r, c = pos
+    if budget is not None:
+        budget.decision()
 
-    for num in range(1, 10):
+    for num in range(1, N+1):
         if is_valid(board, r, c, num):
             board[r][c] = num
-            if solve_backtracking(board):
+            if solve_backtracking(board, budget):
                 return True
             board[r][c] = 0
+    if budget is not None:
+        budget.conflict()
     return False
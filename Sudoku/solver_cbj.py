@@ -1,5 +1,10 @@
-def solve_backjumping(board):
-    cells = [(r,c) for r in range(9) for c in range(9) if board[r][c] == 0]
+from math import isqrt
+from solver_mrv import _geometry
+
+def solve_backjumping(board, budget=None):
+    N = len(board)
+    n = isqrt(N)
+    cells = [(r,c) for r in range(N) for c in range(N) if board[r][c] == 0]
     if not cells:
         return True
 
@@ -8,9 +13,9 @@ def solve_backjumping(board):
     fixed_peers = {i: [] for i in range(len(cells))}
 
     for i,(r,c) in enumerate(cells):
-        peers = {(r,x) for x in range(9)} | {(x,c) for x in range(9)}
-        br,bc = (r//3)*3, (c//3)*3
-        peers |= {(x,y) for x in range(br, br+3) for y in range(bc, bc+3)}
+        peers = {(r,x) for x in range(N)} | {(x,c) for x in range(N)}
+        br,bc = (r//n)*n, (c//n)*n
+        peers |= {(x,y) for x in range(br, br+n) for y in range(bc, bc+n)}
         peers.discard((r,c))
 
         for pr,pc in peers:
@@ -26,8 +31,10 @@ def solve_backjumping(board):
             return True
         r,c = cells[i]
         conflict_sets[i] = set()
+        if budget is not None:
+            budget.decision()
 
-        for val in range(1,10):
+        for val in range(1,N+1):
             conflict = False
             tmp_conf = set()
 
@@ -57,6 +64,8 @@ def solve_backjumping(board):
                     continue
                 return res
 
+        if budget is not None:
+            budget.conflict()
         if not conflict_sets[i]:
             return None
         target = max(conflict_sets[i])
@@ -67,3 +76,123 @@ def solve_backjumping(board):
 
     res = solve(0)
     return res is True
+
+def solve_backjumping_fc(board, budget=None):
+    """
+    CBJ with forward checking and MRV ordering. Candidate values are
+    kept as one bitmask per empty cell, seeded from the fixed peers.
+    Cells are picked from solver_mrv's (candidates, degree) buckets, so
+    ties go to the cell with the most empty peers. Conflict sets are
+    bitsets over cell indices, so the jump target is simply the first
+    ancestor found in the returned set.
+    """
+    N = len(board)
+    full = (1 << (N+1)) - 2
+    cells, peers = _geometry(N)
+    free = [board[r][c] == 0 for r, c, _ in cells]
+    cand = [0] * len(cells)
+    for k, (r, c, _) in enumerate(cells):
+        if free[k]:
+            cand[k] = full
+            for j in peers[k]:
+                if not free[j]:
+                    cand[k] &= ~(1 << board[cells[j][0]][cells[j][1]])
+
+    # Same bucketing as solver_mrv: key = candidates * (D+1) + (D - empty peers)
+    D = len(peers[0])
+    buckets = [set() for _ in range((N+1) * (D+1))]
+    key = [0] * len(cells)
+    degree = [sum(free[j] for j in peers[k]) for k in range(len(cells))]
+    past_fc = [0] * len(cells)
+    lo = len(buckets)
+    left = sum(free)
+
+    def rekey(k):
+        nonlocal lo
+        new = cand[k].bit_count() * (D+1) + D - degree[k]
+        buckets[key[k]].discard(k)
+        buckets[new].add(k)
+        key[k] = new
+        if new < lo:
+            lo = new
+
+    for k in range(len(cells)):
+        if free[k]:
+            rekey(k)
+
+    def take(i):
+        nonlocal left
+        buckets[key[i]].discard(i)
+        free[i] = False
+        left -= 1
+        for j in peers[i]:
+            if free[j]:
+                degree[j] -= 1
+                rekey(j)
+
+    def release(i):
+        nonlocal left
+        free[i] = True
+        left += 1
+        for j in peers[i]:
+            if free[j]:
+                degree[j] += 1
+                rekey(j)
+        rekey(i)
+
+    def solve():
+        nonlocal lo
+        if not left:
+            return True
+        while not buckets[lo]:
+            lo += 1
+        i = next(iter(buckets[lo]))
+        r, c, _ = cells[i]
+        if budget is not None:
+            budget.decision()
+        me = 1 << i
+        take(i)
+        conf = 0
+        vals = cand[i]
+
+        while vals:
+            bit = vals & -vals
+            vals ^= bit
+            board[r][c] = bit.bit_length() - 1
+
+            pruned = []
+            res = None
+            for j in peers[i]:
+                if free[j] and cand[j] & bit:
+                    cand[j] ^= bit
+                    past_fc[j] |= me
+                    pruned.append(j)
+                    if not cand[j]:
+                        conf |= past_fc[j] & ~me
+                        break
+            else:
+                for j in pruned:
+                    rekey(j)
+                res = solve()
+                if res is True:
+                    return True
+
+            for j in pruned:
+                cand[j] |= bit
+                past_fc[j] &= ~me
+                if res is not None:
+                    rekey(j)
+            board[r][c] = 0
+
+            if res is not None:
+                if not res & me:
+                    release(i)
+                    return res
+                conf |= res & ~me
+
+        release(i)
+        if budget is not None:
+            budget.conflict()
+        return conf | past_fc[i]
+
+    return solve() is True
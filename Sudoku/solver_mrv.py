@@ -1,36 +1,125 @@
-def solve_mrv(board):
-    def valid_values(b, r, c):
-        vals = set(range(1, 10))
-        vals -= set(b[r])
-        vals -= {b[i][c] for i in range(9)}
-        br, bc = (r//3)*3, (c//3)*3
-        vals -= {b[i][j] for i in range(br, br+3) for j in range(bc, bc+3)}
-        return vals
-
-    def select_mrv(b):
-        best, best_vals = None, None
-        min_size = 10
-        for r in range(9):
-            for c in range(9):
-                if b[r][c] == 0:
-                    vals = valid_values(b, r, c)
-                    if not vals:
-                        return (r, c), []
-                    if len(vals) < min_size:
-                        min_size = len(vals)
-                        best, best_vals = (r, c), vals
-        return best, best_vals
-
-    cell, vals = select_mrv(board)
-    if cell is None:
-        return True
-    if not vals:
-        return False
+from math import isqrt
+
+# (cells, peers) per board side; both are only read by _search
+_GEOMETRY = {}
+
+def _geometry(N):
+    if N not in _GEOMETRY:
+        n = isqrt(N)
+        cells = [(r, c, (r//n)*n + c//n) for r in range(N) for c in range(N)]
+        peers = []
+        for k, (r, c, b) in enumerate(cells):
+            peers.append([j for j, (rr, cc, bb) in enumerate(cells)
+                          if j != k and (rr == r or cc == c or bb == b)])
+        _GEOMETRY[N] = cells, peers
+    return _GEOMETRY[N]
+
+def _search(board, on_solution, stats, budget=None):
+    N = len(board)
+    full = (1 << (N+1)) - 2
+    cells, peers = _geometry(N)
+    rows, cols, boxes = [0]*N, [0]*N, [0]*N
+    for r, c, b in cells:
+        bit = (1 << board[r][c]) & full
+        rows[r] |= bit; cols[c] |= bit; boxes[b] |= bit
+
+    # Cells are bucketed by key = candidates * (D+1) + (D - empty peers),
+    # so the lowest non-empty bucket holds the MRV cell with the
+    # highest degree. Each placement only re-keys its empty peers.
+    D = len(peers[0])
+    empty = [board[r][c] == 0 for r, c, _ in cells]
+    buckets = [set() for _ in range((N+1) * (D+1))]
+    key = [0] * len(cells)
+    degree = [sum(empty[j] for j in peers[k]) for k in range(len(cells))]
+    lo = len(buckets)
+    left = sum(empty)
+
+    def candidates(k):
+        r, c, b = cells[k]
+        return full & ~(rows[r] | cols[c] | boxes[b])
+
+    def rekey(k):
+        nonlocal lo
+        new = bin(candidates(k)).count("1") * (D+1) + D - degree[k]
+        buckets[key[k]].discard(k)
+        buckets[new].add(k)
+        key[k] = new
+        if new < lo:
+            lo = new
+
+    for k in range(len(cells)):
+        if empty[k]:
+            rekey(k)
 
-    r, c = cell
-    for v in vals:
+    def place(k, v):
+        nonlocal left
+        r, c, b = cells[k]
+        bit = 1 << v
         board[r][c] = v
-        if solve_mrv(board):
-            return True
+        rows[r] |= bit; cols[c] |= bit; boxes[b] |= bit
+        buckets[key[k]].discard(k)
+        empty[k] = False
+        left -= 1
+        for j in peers[k]:
+            if empty[j]:
+                degree[j] -= 1
+                rekey(j)
+
+    def unplace(k, v):
+        nonlocal left
+        r, c, b = cells[k]
+        bit = 1 << v
         board[r][c] = 0
-    return False
+        rows[r] ^= bit; cols[c] ^= bit; boxes[b] ^= bit
+        empty[k] = True
+        left += 1
+        for j in peers[k]:
+            if empty[j]:
+                degree[j] += 1
+                rekey(j)
+        rekey(k)
+
+    def select_mrv():
+        nonlocal lo
+        while not buckets[lo]:
+            lo += 1
+        return next(iter(buckets[lo]))
+
+    def search():
+        if stats is not None:
+            stats['nodes'] = stats.get('nodes', 0) + 1
+        if not left:
+            return on_solution()
+        k = select_mrv()
+        vals = candidates(k)
+        if not vals:
+            if budget is not None:
+                budget.conflict()
+            return False
+        if budget is not None:
+            budget.decision()
+
+        while vals:
+            bit = vals & -vals
+            vals ^= bit
+            v = bit.bit_length() - 1
+            place(k, v)
+            if search():
+                return True
+            unplace(k, v)
+        return False
+
+    return search()
+
+def solve_mrv(board, stats=None, budget=None):
+    return _search(board, lambda: True, stats, budget)
+
+def count_solutions(board, limit=2, stats=None, budget=None):
+    """Counts solutions up to `limit`; the board is left untouched."""
+    count = 0
+    def found():
+        nonlocal count
+        count += 1
+        return count >= limit
+    _search([row[:] for row in board], found, stats, budget)
+    return count
@@ -1,18 +1,22 @@
 import copy
+from math import isqrt
+
+def solve_unit_prop(board, budget=None):
+    N = len(board)
+    n = isqrt(N)
 
-def solve_unit_prop(board):
     def peers(r, c):
-        ps = {(r, i) for i in range(9)} | {(i, c) for i in range(9)}
-        br, bc = (r//3)*3, (c//3)*3
-        ps |= {(i, j) for i in range(br, br+3) for j in range(bc, bc+3)}
+        ps = {(r, i) for i in range(N)} | {(i, c) for i in range(N)}
+        br, bc = (r//n)*n, (c//n)*n
+        ps |= {(i, j) for i in range(br, br+n) for j in range(bc, bc+n)}
         ps.remove((r, c))
         return ps
 
     def init_domains():
         d = {}
-        for r in range(9):
-            for c in range(9):
-                d[(r,c)] = {board[r][c]} if board[r][c] else set(range(1,10))
+        for r in range(N):
+            for c in range(N):
+                d[(r,c)] = {board[r][c]} if board[r][c] else set(range(1,N+1))
         return d
 
     def propagate(d):
@@ -32,11 +36,15 @@ def solve_unit_prop(board):
 
     def search(d):
         if not propagate(d):
+            if budget is not None:
+                budget.conflict()
             return None
         if all(len(v) == 1 for v in d.values()):
             return d
         unassigned = {k: v for k,v in d.items() if len(v) > 1}
         var = min(unassigned, key=lambda k: len(unassigned[k]))
+        if budget is not None:
+            budget.decision()
         for val in unassigned[var]:
             nd = copy.deepcopy(d)
             nd[var] = {val}
@@ -1,6 +1,7 @@
 import time
 import copy
 import sys
+from batch import solve_many
 
 # Increase recursion depth just in case
 sys.setrecursionlimit(5000)
@@ -324,7 +325,7 @@ def solve_backjumping(board):
 # 3. BENCHMARK RUNNER
 # ==========================================
 
-def run_benchmark():
+def run_benchmark(workers=None):
     test_file = "Sudoku_Dataset/sudoku95test.txt"
     soln_file = "Sudoku_Dataset/soln_raw.txt"
     output_file = "benchmark_results.txt"
@@ -354,18 +355,14 @@ def run_benchmark():
         start_time = time.time()
         correct_count = 0
         
-        # Copy puzzles to avoid modification between solvers
-        current_puzzles = copy.deepcopy(puzzles)
+        # Puzzles are shipped to the pool as byte encodings, so the
+        # shared list is never modified between solvers
+        outcomes = solve_many(puzzles, solver_func, workers, solutions=solutions)
         
-        for i, puzzle in enumerate(current_puzzles):
-            # Run solver
-            try:
-                solver_func(puzzle)
-            except Exception as e:
-                print(f"  Error on puzzle {i+1}: {e}")
-            
-            # Verify
-            if boards_match(puzzle, solutions[i]):
+        for i, (_, _, ok, error) in enumerate(outcomes):
+            if error is not None:
+                print(f"  Error on puzzle {i+1}: {error}")
+            elif ok:
                 correct_count += 1
             else:
                 print(f"  Mismatch on puzzle {i+1}")